@@ -0,0 +1,77 @@
+"""Shared setup for the benchmark scripts.
+
+Benchmarks run against MONGODB_URI (default mongodb://localhost:27017) in the
+MONGODB_DATABASE database (default chichi_blog_bench), which they drop and
+reseed; they refuse to run against the application's own database. Run them
+from the repository root, e.g. `python -m benchmarks.pagination_depth`.
+"""
+import os
+import sys
+from statistics import median
+from time import perf_counter
+from typing import Callable, Dict, List
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:27017')
+os.environ.setdefault('MONGODB_DATABASE', 'chichi_blog_bench')
+# Benchmarks measure the database and the encoders, not the response cache.
+os.environ.setdefault('ARTICLE_CACHE_ENABLED', 'false')
+os.environ.setdefault('ENSURE_INDEXES_ON_STARTUP', 'false')
+
+from src.config import MONGODB_DATABASE  # noqa: E402
+
+if MONGODB_DATABASE == 'chichi_blog_db':
+    sys.exit("Refusing to benchmark against chichi_blog_db; set MONGODB_DATABASE to a scratch database.")
+
+WORDS = ('mongo index query cursor page article blog title body search fuzzy trigram '
+         'latency budget cache worker python flask admin token serializer projection').split()
+
+
+def reset_database():
+    """Drops the benchmark database and creates the application's indexes."""
+    from src.api.models import connection
+    from src.api.models.indexes import ensure_indexes
+    connection.client().drop_database(connection.database_name)
+    ensure_indexes()
+
+
+def body_text(index: int, words: int) -> str:
+    return ' '.join(WORDS[(index * 7 + position * 3) % len(WORDS)] for position in range(words))
+
+
+def seed_articles(count: int, body_words: int = 200, batch_size: int = 1000, admin_id: str = 'benchmark'):
+    """Inserts `count` articles through Article.insert_articles, so derived fields match production."""
+    from src.api.models.Article import Article
+    for start in range(0, count, batch_size):
+        Article.insert_articles([{
+            'title': f"Benchmark article {index} {WORDS[index % len(WORDS)]}",
+            'body': body_text(index, body_words),
+            'image_url': f"https://example.com/{index}.png",
+            'admin_id': admin_id
+        } for index in range(start, min(start + batch_size, count))])
+
+
+def measure(run: Callable, repeat: int = 20, warm_up: int = 2) -> Dict:
+    """Wall-clock milliseconds for `run()`, as p50/p95/min over `repeat` calls."""
+    for _ in range(warm_up):
+        run()
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        run()
+        timings.append((perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'p50_ms': round(median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'min_ms': round(timings[0], 3)
+    }
+
+
+def print_table(rows: List[Dict]):
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = [max(len(str(column)), *(len(str(row[column])) for row in rows)) for column in columns]
+    print('  '.join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print('  '.join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
@@ -0,0 +1,73 @@
+"""Encoding a 1,000-article page: Flask's default provider against FastJSONProvider.
+
+    python -m benchmarks.json_encoding [--articles 1000] [--body-words 300]
+
+No database is needed; documents are built in memory the way pymongo returns
+them, with ObjectId and datetime values. "before" is the old path, copying
+every document through Serializer.dump to stringify _id and encoding with
+Flask's default provider; "after" hands the documents to FastJSONProvider
+as they are.
+"""
+import argparse
+from datetime import datetime, timedelta
+from benchmarks.common import body_text, measure, print_table
+
+
+def documents(count: int, body_words: int):
+    from bson.objectid import ObjectId
+    created_at = datetime(2024, 1, 1)
+    return [{
+        '_id': ObjectId(),
+        'title': f"Benchmark article {index}",
+        'body': body_text(index, body_words),
+        'image_url': f"https://example.com/{index}.png",
+        'created_at': created_at + timedelta(minutes=index),
+        'updated_at': None if index % 2 else created_at + timedelta(days=1, minutes=index)
+    } for index in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=1000)
+    parser.add_argument('--body-words', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=50)
+    arguments = parser.parse_args()
+
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+    from src.modules.json_provider import FastJSONProvider
+    from src.modules.Serializer import Serializer
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    serializer = Serializer.compile(['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'])
+    page = documents(arguments.articles, arguments.body_words)
+
+    def page_body(data):
+        return {'error': False, 'data': data}
+
+    cases = {
+        'before: Serializer.dump + default provider': lambda: default_provider.dumps(page_body(serializer.dump(page))),
+        'Serializer.dump + FastJSONProvider': lambda: fast_provider.dumps(page_body(serializer.dump(page))),
+        'after: FastJSONProvider on raw documents': lambda: fast_provider.dumps(page_body(page)),
+    }
+
+    with app.app_context():
+        assert default_provider.loads(default_provider.dumps(page_body(serializer.dump(page)))) == \
+            fast_provider.loads(fast_provider.dumps(page_body(page))), "providers disagree"
+        size = len(fast_provider.dumps(page_body(page)))
+        rows = []
+        for name, run in cases.items():
+            timing = measure(run, arguments.repeat)
+            rows.append(dict(case=name, **timing))
+
+    baseline = rows[0]['p50_ms']
+    for row in rows:
+        row['speedup'] = f"{baseline / row['p50_ms']:.1f}x"
+    print(f"{arguments.articles} articles, {size / 1024:.0f} KiB of JSON")
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Login throughput and article read latency under a mixed load.
+
+    gunicorn -c gunicorn.conf.py -w 4 -b 127.0.0.1:8000 app:app   # against a scratch database
+    python -m benchmarks.login_throughput --url http://127.0.0.1:8000 --password "$DEFAULT_MAIN_ADMIN_PASS"
+
+Runs login threads and article-reading threads against a running server for
+a fixed time, then reports logins per second, how many were turned away with
+503 (no hashing slot within PASSWORD_HASH_QUEUE_TIMEOUT) and read p50/p95.
+Run it with different PASSWORD_HASH_CONCURRENCY values on the server to see
+reads stay fast while logins queue.
+"""
+import argparse
+from base64 import b64encode
+from statistics import median
+from threading import Event, Lock, Thread
+from time import perf_counter, sleep
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from benchmarks.common import print_table
+
+
+def call(url: str, headers=None) -> int:
+    try:
+        with urlopen(Request(url, headers=headers or {}), timeout=30) as response:
+            response.read()
+            return response.status
+    except HTTPError as error:
+        return error.code
+    except URLError:
+        return 0
+
+
+def percentile(timings, fraction: float) -> float:
+    if not timings:
+        return None
+    timings = sorted(timings)
+    return round(timings[min(len(timings) - 1, int(len(timings) * fraction))], 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--email', default='chichi@email.com')
+    parser.add_argument('--password', required=True, help="the server's DEFAULT_MAIN_ADMIN_PASS")
+    parser.add_argument('--login-threads', type=int, default=16)
+    parser.add_argument('--read-threads', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=20)
+    arguments = parser.parse_args()
+
+    # Creates the main admin on a fresh database; a 400 means it already exists.
+    call(f"{arguments.url}/api/main-admin/create-main-admin")
+    credentials = b64encode(f"{arguments.email}:{arguments.password}".encode()).decode()
+    login_url = f"{arguments.url}/api/admin/login"
+    read_url = f"{arguments.url}/api/public-article/pagination/article-pagination?page=1&limit=20&view=summary"
+    if call(login_url, {'Authorization': f"Basic {credentials}"}) != 200:
+        raise SystemExit("login failed; check --url, --email and --password")
+
+    stop = Event()
+    lock = Lock()
+    logins = {'ok': 0, 'busy': 0, 'failed': 0, 'timings': []}
+    reads = {'ok': 0, 'failed': 0, 'timings': []}
+
+    def login_loop():
+        while not stop.is_set():
+            started = perf_counter()
+            status = call(login_url, {'Authorization': f"Basic {credentials}"})
+            elapsed = (perf_counter() - started) * 1000
+            with lock:
+                outcome = 'ok' if status == 200 else 'busy' if status == 503 else 'failed'
+                logins[outcome] += 1
+                if status == 200:
+                    logins['timings'].append(elapsed)
+
+    def read_loop():
+        while not stop.is_set():
+            started = perf_counter()
+            status = call(read_url)
+            elapsed = (perf_counter() - started) * 1000
+            with lock:
+                reads['ok' if status == 200 else 'failed'] += 1
+                if status == 200:
+                    reads['timings'].append(elapsed)
+
+    threads = [Thread(target=login_loop) for _ in range(arguments.login_threads)]
+    threads += [Thread(target=read_loop) for _ in range(arguments.read_threads)]
+    started = perf_counter()
+    for thread in threads:
+        thread.start()
+    sleep(arguments.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - started
+
+    print(f"{arguments.login_threads} login threads, {arguments.read_threads} read threads, {elapsed:.1f}s")
+    print_table([{
+        'requests': 'login',
+        'per_second': round(logins['ok'] / elapsed, 1),
+        'ok': logins['ok'],
+        '503': logins['busy'],
+        'failed': logins['failed'],
+        'p50_ms': round(median(logins['timings']), 1) if logins['timings'] else None,
+        'p95_ms': percentile(logins['timings'], 0.95)
+    }, {
+        'requests': 'read',
+        'per_second': round(reads['ok'] / elapsed, 1),
+        'ok': reads['ok'],
+        '503': '-',
+        'failed': reads['failed'],
+        'p50_ms': round(median(reads['timings']), 1) if reads['timings'] else None,
+        'p95_ms': percentile(reads['timings'], 0.95)
+    }])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Page latency by depth: skip/limit pagination against _id cursors.
+
+    python -m benchmarks.pagination_depth [--articles 100000] [--limit 20]
+
+Offset pages get slower the deeper they are, because the server walks past
+every skipped index entry. Cursor pages should stay flat.
+"""
+import argparse
+from benchmarks.common import measure, print_table, reset_database, seed_articles
+
+DEPTHS = (1, 10, 100, 1000, 5000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--no-seed', action='store_true', help="reuse the articles already in the database")
+    arguments = parser.parse_args()
+
+    from src.api.models.Article import Article, articles
+    from src.modules.cursor import NEXT, encode_cursor
+    if not arguments.no_seed:
+        reset_database()
+        seed_articles(arguments.articles, body_words=50)
+    total = articles.count_documents({})
+
+    rows = []
+    for page in DEPTHS:
+        skip = (page - 1) * arguments.limit
+        if skip >= total:
+            break
+        # The cursor a client would hold after reading the previous pages.
+        boundary = next(iter(articles.find({}, {'_id': 1}).sort('_id', 1).skip(skip - 1).limit(1)), None) if skip else None
+        cursor = encode_cursor(NEXT, boundary['_id']) if boundary else None
+
+        offset = measure(lambda: Article.paginate_articles(page, arguments.limit, ['_id', 'title']), arguments.repeat)
+        keyset = measure(lambda: Article.cursor_page({}, cursor, arguments.limit, ['_id', 'title']), arguments.repeat)
+        rows.append({
+            'page': page,
+            'skip': skip,
+            'offset_p50_ms': offset['p50_ms'],
+            'offset_p95_ms': offset['p95_ms'],
+            'cursor_p50_ms': keyset['p50_ms'],
+            'cursor_p95_ms': keyset['p95_ms']
+        })
+
+    print(f"{total} articles, {arguments.limit} per page")
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
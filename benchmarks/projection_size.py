@@ -0,0 +1,54 @@
+"""Bytes on the wire and latency of a 100-article page by projection.
+
+    python -m benchmarks.projection_size [--articles 2000] [--body-words 5000]
+
+Compares the full document, the summary view and a title-only projection over
+articles with large bodies. Bytes are the BSON size of the returned documents,
+read as RawBSONDocument so decoding doesn't skew the timings.
+"""
+import argparse
+from benchmarks.common import measure, print_table, reset_database, seed_articles
+
+PAGE_SIZE = 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--body-words', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--no-seed', action='store_true', help="reuse the articles already in the database")
+    arguments = parser.parse_args()
+
+    from bson.codec_options import CodecOptions
+    from bson.raw_bson import RawBSONDocument
+    from src.api.models.Article import ARTICLE_VIEWS, Article, articles
+    from src.modules.Serializer import Serializer
+    if not arguments.no_seed:
+        reset_database()
+        seed_articles(arguments.articles, body_words=arguments.body_words)
+
+    raw_articles = articles.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+    projections = dict(ARTICLE_VIEWS, title=['_id', 'title'])
+
+    rows = []
+    for name, fields in projections.items():
+        projection = Serializer.compile(fields).projection()
+        page_bytes = sum(len(document.raw) for document in raw_articles.find({}, projection).limit(PAGE_SIZE))
+        fetch = measure(lambda: list(raw_articles.find({}, projection).limit(PAGE_SIZE)), arguments.repeat)
+        page = measure(lambda: Article.paginate_articles(1, PAGE_SIZE, fields), arguments.repeat)
+        rows.append({
+            'projection': name,
+            'page_kib': round(page_bytes / 1024, 1),
+            'fetch_p50_ms': fetch['p50_ms'],
+            'fetch_p95_ms': fetch['p95_ms'],
+            'paginate_p50_ms': page['p50_ms'],
+            'paginate_p95_ms': page['p95_ms']
+        })
+
+    print(f"{PAGE_SIZE} articles per page, {arguments.body_words} words per body")
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
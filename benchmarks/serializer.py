@@ -0,0 +1,74 @@
+"""Per-document cost of Serializer.serialize, dump and dump_find.
+
+    python -m benchmarks.serializer [--documents 10000]
+
+No database is needed. Each attribute set (full, summary, title) is timed on
+documents holding every article field, the way an unprojected find returns
+them, next to a plain dict.get copy as a reference point.
+"""
+import argparse
+from datetime import datetime
+from benchmarks.common import body_text, measure, print_table
+
+
+def documents(count: int):
+    from bson.objectid import ObjectId
+    return [{
+        '_id': ObjectId(),
+        'title': f"Benchmark article {index}",
+        'body': body_text(index, 50),
+        'excerpt': body_text(index, 20),
+        'word_count': 50,
+        'reading_time': 1,
+        'image_url': f"https://example.com/{index}.png",
+        'admin_id': 'benchmark',
+        'created_at': datetime(2024, 1, 1),
+        'updated_at': None
+    } for index in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    arguments = parser.parse_args()
+
+    from src.api.models.Article import ARTICLE_VIEWS
+    from src.modules.Serializer import Serializer
+    batch = documents(arguments.documents)
+
+    rows = []
+    for name, fields in dict(ARTICLE_VIEWS, title=['_id', 'title']).items():
+        serializer = Serializer.compile(fields)
+
+        def reference():
+            return [{attr: str(document['_id']) if attr == '_id' else document.get(attr) for attr in fields}
+                    for document in batch]
+
+        def serialize_each():
+            serialize = serializer.serialize
+            for document in batch:
+                serialize(document)
+
+        assert serializer.dump(batch) == reference(), f"{name}: serializer and reference disagree"
+        cases = {
+            'dict.get reference': reference,
+            'serialize': serialize_each,
+            'dump': lambda: serializer.dump(batch),
+            'dump_find': lambda: serializer.dump_find(iter(batch)),
+        }
+        for case, run in cases.items():
+            timing = measure(run, arguments.repeat)
+            rows.append({
+                'fields': name,
+                'case': case,
+                'p50_us_per_doc': round(timing['p50_ms'] * 1000 / len(batch), 3),
+                'min_us_per_doc': round(timing['min_ms'] * 1000 / len(batch), 3)
+            })
+
+    print(f"{arguments.documents} documents per run")
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
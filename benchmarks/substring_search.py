@@ -0,0 +1,62 @@
+"""Substring search: trigram postings against a plain case-insensitive $regex.
+
+    python -m benchmarks.substring_search [--sizes 10000,100000]
+
+For each collection size the database is reseeded, then every needle is run
+through Article.substring_ids (trigram candidates checked by the server) and
+through the $regex scan it replaced, both returning ids only. Fuzzy search is
+timed on a misspelt needle alongside.
+"""
+import argparse
+import re
+from benchmarks.common import measure, print_table, reset_database, seed_articles
+
+# A rare phrase, a common one, and one shorter than a trigram (regex only).
+NEEDLES = ('article 4242', 'mongo cursor', 'qu')
+FUZZY_NEEDLE = 'trigarm serializr'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000')
+    parser.add_argument('--body-words', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=10)
+    arguments = parser.parse_args()
+
+    from src.api.models.Article import Article, articles
+
+    def regex_ids(needle):
+        contains = {'$regex': re.escape(needle), '$options': 'i'}
+        query = {'$or': [{'title': contains}, {'body': contains}]}
+        return [document['_id'] for document in articles.find(query, {'_id': 1}).sort('_id', 1).limit(1000)]
+
+    rows = []
+    for size in (int(size) for size in arguments.sizes.split(',')):
+        reset_database()
+        seed_articles(size, body_words=arguments.body_words)
+        for needle in NEEDLES:
+            trigram = measure(lambda: Article.substring_ids(needle), arguments.repeat)
+            regex = measure(lambda: regex_ids(needle), arguments.repeat)
+            rows.append({
+                'articles': size,
+                'needle': repr(needle),
+                'matches': len(Article.substring_ids(needle)),
+                'trigram_p50_ms': trigram['p50_ms'],
+                'regex_p50_ms': regex['p50_ms'],
+                'speedup': f"{regex['p50_ms'] / trigram['p50_ms']:.1f}x"
+            })
+        fuzzy = measure(lambda: Article.fuzzy_ids(FUZZY_NEEDLE), arguments.repeat)
+        rows.append({
+            'articles': size,
+            'needle': f"{FUZZY_NEEDLE!r} (fuzzy)",
+            'matches': len(Article.fuzzy_ids(FUZZY_NEEDLE)),
+            'trigram_p50_ms': fuzzy['p50_ms'],
+            'regex_p50_ms': '-',
+            'speedup': '-'
+        })
+
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
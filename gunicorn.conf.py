@@ -0,0 +1,37 @@
+# Worker hooks only; bind, workers and the rest stay on the command line.
+from src.config import MONGO_WARM_UP
+
+
+def post_fork(server, worker):
+    # The models' client is created per process, so a worker forked from a
+    # --preload master never reuses the master's sockets.
+    from src.api.models import connection
+    connection.reset()
+
+
+def post_worker_init(worker):
+    # Runs before the worker starts accepting requests.
+    if MONGO_WARM_UP:
+        from src.api.models import connection
+        connection.warm_up()
+
+
+def on_starting(server):
+    # Worker metric files from a previous run would otherwise be summed in.
+    from src.modules.metrics import clear_directory
+    clear_directory()
+    # Created before any worker is forked, so PASSWORD_HASH_CONCURRENCY limits
+    # hashing across all workers rather than within each one.
+    from src.modules.password_hasher import share_across_processes
+    share_across_processes()
+
+
+def on_exit(server):
+    from src.modules.password_hasher import hash_slots
+    if hasattr(hash_slots, 'remove'):
+        hash_slots.remove()
+
+
+def worker_exit(server, worker):
+    from src.modules.metrics import flush
+    flush(force=True)
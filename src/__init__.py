@@ -1,16 +1,30 @@
-from flask import Flask,jsonify
+import json
+from time import perf_counter
+import click
+from flask import Flask,g,jsonify,request
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-from src.config import SECRET_KEY,JWT_ACCESS_TOKEN_EXPIRES,JWT_QUERY_STRING_NAME,JWT_REFRESH_TOKEN_EXPIRES,JWT_SECRET_KEY,JWT_TOKEN_LOCATION
+from src.config import SECRET_KEY,JWT_ACCESS_TOKEN_EXPIRES,JWT_QUERY_STRING_NAME,JWT_REFRESH_TOKEN_EXPIRES,JWT_SECRET_KEY,JWT_TOKEN_LOCATION,ENSURE_INDEXES_ON_STARTUP,METRICS_ENABLED,SLOW_QUERY_LOG,SLOW_QUERY_MS
+from src.api.models import connection
+from src.api.models.indexes import ensure_indexes
+from src.api.models.Article import Article
+from src.modules.json_provider import FastJSONProvider
+from src.modules.password_hasher import HashingUnavailable
+from src.modules.time_budget import QueryBudgetExceeded
+from src.modules.metrics import command_listener, flush as flush_metrics, request_latency
+from src.modules.slow_query import slow_query_listener, summarize as summarize_slow_queries
+from src.modules.query_count import query_count_listener, repeated_queries, request_query_count, tracking as tracking_queries
 from src.api.routes.admin import admin
 from src.api.routes.article import article
 from src.api.routes.main_admin import main_admin
 from src.api.routes.public_article import public_article
+from src.api.routes.metrics import metrics
 
 
 def create_app():
 
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_mapping(
         SECRET_KEY=SECRET_KEY,
         JWT_SECRET_KEY=JWT_SECRET_KEY,
@@ -35,6 +49,70 @@ def create_app():
     app.register_blueprint(main_admin)
     app.register_blueprint(public_article)
 
+    if METRICS_ENABLED:
+        app.register_blueprint(metrics)
+        connection.add_listener(command_listener)
+
+        @app.before_request
+        def start_timer():
+            g.request_started = perf_counter()
+
+        @app.after_request
+        def record_latency(response):
+            started = g.pop('request_started', None)
+            if started is not None:
+                request_latency.observe(
+                    (request.endpoint or "unmatched", request.method, str(response.status_code)),
+                    perf_counter() - started)
+            flush_metrics()
+            return response
+
+    if SLOW_QUERY_MS:
+        connection.add_listener(slow_query_listener)
+
+    connection.add_listener(query_count_listener)
+
+    @app.after_request
+    def report_query_count(response):
+        # Debug aid: round trips per request, and a warning for the same
+        # query shape run over and over (usually an N+1 loop).
+        if tracking_queries():
+            response.headers['X-DB-Query-Count'] = str(request_query_count())
+            for shape, count in repeated_queries().items():
+                app.logger.warning("query ran %d times in %s: %s", count, request.endpoint, shape)
+        return response
+
+    if ENSURE_INDEXES_ON_STARTUP:
+        # Run by each process when it first connects, so building the app
+        # never needs a reachable database.
+        connection.on_connect(ensure_indexes)
+
+    @app.cli.command("ensure-indexes")
+    def ensure_indexes_command():
+        for name in ensure_indexes():
+            print(name)
+
+    @app.cli.command("backfill-articles")
+    def backfill_articles_command():
+        print(f"{Article.backfill_derived_fields()} articles updated")
+
+    @app.cli.command("slow-queries")
+    @click.argument("path", required=False)
+    @click.option("--limit", default=20, help="Number of query shapes to show.")
+    def slow_queries_command(path, limit):
+        """Summarizes the slow query log by query shape, slowest total first."""
+        path = path or SLOW_QUERY_LOG
+        if not path:
+            raise click.UsageError("pass the log path or set SLOW_QUERY_LOG")
+        with open(path) as file:
+            summary = summarize_slow_queries(file)
+        for group in summary[:limit]:
+            print(f"{group['count']:>6}x  total {group['total_ms']}ms  p50 {group['p50_ms']}ms  max {group['max_ms']}ms  "
+                  f"pool wait {round(group['pool_wait_ms'], 1)}ms  {group['command']} {group['collection']}")
+            print(f"        shape:  {json.dumps(group['shape'], sort_keys=True)}")
+            print(f"        routes: {', '.join(group['routes'])}")
+            print(f"        plans:  {'; '.join(group['plans']) or 'not explained'}")
+
     @app.errorhandler(404)
     def handle_404(e):
         return jsonify({
@@ -42,4 +120,18 @@ def create_app():
             'message':"Not Found"
         })
 
+    @app.errorhandler(HashingUnavailable)
+    def handle_hashing_unavailable(e):
+        return jsonify({
+            'error':True,
+            'message':"server is busy, try again later"
+        }), 503, {'Retry-After': '1'}
+
+    @app.errorhandler(QueryBudgetExceeded)
+    def handle_query_budget_exceeded(e):
+        return jsonify({
+            'error':True,
+            'message':"query took too long, try a narrower request"
+        }), 503
+
     return app
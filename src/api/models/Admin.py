@@ -3,14 +3,20 @@ from typing import Dict
 from src.modules.Serializer import Serializer
 from datetime import datetime
 from bson.objectid import ObjectId
+from src.modules.identity_cache import admin_cache, invalidate_admin
+from src.modules.valid_object_id import valid_object_id
 
 
 admins = db.admins
+# What a JWT identity resolves to. The password hash is left out so that a
+# cached identity can never be used to check a password.
+IDENTITY_ATTRIBUTES = ['_id', 'email', 'name', 'type', 'created_at', 'updated_at']
 
 class Admin:
 
     @staticmethod
     def create_admin(new_admin: Dict) -> bool:
+        # Raises DuplicateKeyError when the email is already in use (unique index).
         db_response = admins.insert_one({
             'name':new_admin['name'],
             'password':new_admin['password'],
@@ -24,38 +30,75 @@ class Admin:
 
     @staticmethod
     def get_admin_by_email(email:str,needed_attributes=['_id','email','password','name','type','created_at','updated_at']) -> Dict:
-        db_response = admins.find_one({'email':email})
-        return Serializer(needed_attributes).serialize(db_response) if db_response else {}
+        serializer = Serializer.compile(needed_attributes)
+        db_response = admins.find_one({'email':email}, serializer.projection())
+        return serializer.serialize(db_response) if db_response else {}
 
     @staticmethod
     def get_admin_by_type(type:str,needed_attributes=['_id','email','password','name','type','created_at','updated_at']) -> Dict:
-        db_response = admins.find_one({'type': type})
+        serializer = Serializer.compile(needed_attributes)
+        db_response = admins.find_one({'type': type}, serializer.projection())
         if db_response:
-            return Serializer(needed_attributes).serialize(db_response)
+            return serializer.serialize(db_response)
 
         return {}
 
     @staticmethod
     def get_admin_by_id(id: str, needed_attributes=['_id', 'email', 'password', 'name', 'type', 'created_at', 'updated_at']) -> Dict:
-        db_response = admins.find_one({'_id': ObjectId(id)})
-        return Serializer(needed_attributes).serialize(db_response) if db_response else {}
+        serializer = Serializer.compile(needed_attributes)
+        db_response = admins.find_one({'_id': ObjectId(id)}, serializer.projection())
+        return serializer.serialize(db_response) if db_response else {}
+
+    @staticmethod
+    def get_cached_admin(id: str) -> Dict:
+        # Resolves a JWT identity; identities that are not admin ids (e.g. "main") resolve to {}.
+        if not valid_object_id(id):
+            return {}
+        admin = admin_cache.get(id)
+        if admin is None:
+            admin = Admin.get_admin_by_id(id, IDENTITY_ATTRIBUTES)
+            admin_cache.set(id, admin)
+        return admin
 
     @staticmethod
     def update_admin_password(admin_id:str,password:str) -> bool:
         query = admins.update_one({'_id': ObjectId(admin_id)}, {'$set': {'password': password, 'updated_at': datetime.now()}})
-        return True if query.raw_result['nModified'] == 1 else False
+        if query.matched_count == 1:
+            invalidate_admin(admin_id)
+            return True
+        return False
     
+    @staticmethod
+    def rehash_password(admin_id:str,old_password:str,password:str) -> bool:
+        # Upgrades hash parameters on login; only applies if the hash is unchanged since it was read.
+        query = admins.update_one({'_id': ObjectId(admin_id), 'password': old_password}, {'$set': {'password': password}})
+        if query.modified_count == 1:
+            invalidate_admin(admin_id)
+            return True
+        return False
+
     @staticmethod
     def update_admin_email(admin_id:str,email:str) -> bool:
+        # Raises DuplicateKeyError when the email is already in use (unique index).
+        # Succeeds whenever the admin matched, so keeping one's own email is fine.
         query = admins.update_one({'_id': ObjectId(admin_id)}, {'$set': {'email': email, 'updated_at': datetime.now()}})
-        return True if query.raw_result['nModified'] == 1 else False
+        if query.matched_count == 1:
+            invalidate_admin(admin_id)
+            return True
+        return False
     
     @staticmethod
     def update_admin_name(admin_id:str,name:str) -> bool:
         query = admins.update_one({'_id': ObjectId(admin_id)}, {'$set': {'name': name, 'updated_at': datetime.now()}})
-        return True if query.raw_result['nModified'] == 1 else False
+        if query.matched_count == 1:
+            invalidate_admin(admin_id)
+            return True
+        return False
     
     @staticmethod
     def delete_admin(email: str) -> bool:
-        db_response = admins.find_one_and_delete({'email': email})
-        return True if db_response else False
+        db_response = admins.find_one_and_delete({'email': email}, {'_id': 1})
+        if db_response:
+            invalidate_admin(db_response['_id'])
+            return True
+        return False
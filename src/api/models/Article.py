@@ -1,39 +1,151 @@
 from . import db
-from typing import Dict,List
+import re
+from math import ceil
+from typing import Dict,Iterable,Iterator,List
 from src.modules.Serializer import Serializer
+from src.modules.Pagination import Pagination
+from src.modules.article_summary import summarize
+from src.modules.search import FIELD_WEIGHTS, bm25, field_terms, idf, query_terms, search_fields, title_key, trigrams
+from src.modules.response_cache import invalidate_article
+from src.modules.valid_object_id import valid_object_id
+from src.modules import time_budget
+from src.modules.cursor import NEXT, PREV, encode_cursor, decode_cursor
+from .indexes import TITLE_COLLATION
+from .WriteOutcome import WriteOutcome
+from src.config import ARTICLE_STREAM_BATCH_SIZE, SEARCH_MAX_CANDIDATES, SEARCH_MAX_SCANNED, FUZZY_SEARCH_THRESHOLD
 from datetime import datetime
 from bson.objectid import ObjectId
 
+# pymongo's sort directions. pymongo itself is only imported inside the
+# methods that need its classes, so importing the model stays cheap.
+ASCENDING = 1
+DESCENDING = -1
+
 articles = db.articles
+# One document per collection holding a version counter bumped on every write,
+# used as a cheap validator for conditional GETs on lists, plus the document
+# count and total title/body token lengths used for BM25 ranking.
+collection_versions = db.collection_versions
+
+ARTICLE_ATTRIBUTES = ['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']
+SUMMARY_ATTRIBUTES = ['_id', 'title', 'excerpt', 'word_count', 'reading_time', 'image_url', 'created_at', 'updated_at']
+ARTICLE_VIEWS = {'full': ARTICLE_ATTRIBUTES, 'summary': SUMMARY_ATTRIBUTES}
+# Fields compared in place of a submitted one to detect an unchanged value.
+COMPARED_FIELDS = {'body': 'body_hash'}
 
 
 class Article:
 
     @staticmethod
-    def create_article(new_article:Dict) -> bool:
-        db_response = articles.insert_one({
+    def new_document(new_article: Dict) -> Dict:
+        return {
             'title': new_article['title'],
             'body': new_article['body'],
             'image_url': new_article['image_url'],
             'admin_id': new_article['admin_id'],
             'created_at': datetime.now(),
             'updated_at': None,
-        })
+            **summarize(new_article['body']),
+            **search_fields(new_article['title'], new_article['body'])
+        }
+
+    @staticmethod
+    def create_article(new_article:Dict) -> bool:
+        # Raises DuplicateKeyError when the title is already taken (unique index).
+        document = Article.new_document(new_article)
+        db_response = articles.insert_one(document)
+
+        if db_response.inserted_id:
+            Article.articles_changed(None, Article.search_stats(None, document))
+            return True
+        return False
 
-        return True if db_response.inserted_id else False
+    @staticmethod
+    def insert_articles(new_articles: List) -> Dict:
+        # One unordered insert_many per batch, so a bad record doesn't stop the
+        # rest. Returns the Mongo write error for each failed position.
+        from pymongo.errors import BulkWriteError
+        documents = [Article.new_document(new_article) for new_article in new_articles]
+        failed = {}
+        try:
+            articles.insert_many(documents, ordered=False)
+        except BulkWriteError as error:
+            failed = {write_error['index']: write_error for write_error in error.details.get('writeErrors', [])}
+
+        inserted = [document for index, document in enumerate(documents) if index not in failed]
+        if inserted:
+            Article.articles_changed(None, Article.total_stats(Article.search_stats(None, document) for document in inserted))
+        return failed
     
     @staticmethod
-    def get_article(query_values:Dict,needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Dict:
-        db_response = articles.find_one(query_values)
-        return Serializer(needed_attributes).serialize(db_response) if db_response else {}
+    def get_article(query_values:Dict,needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], collation=None) -> Dict:
+        serializer = Serializer.compile(needed_attributes)
+        db_response = articles.find_one(query_values, serializer.projection(), collation=collation)
+        return serializer.serialize(db_response) if db_response else {}
+
+    @staticmethod
+    def articles_changed(id: str = None, search_stats: Dict = None, ids: List = ()):
+        # ids lets a bulk write invalidate every article it touched and still
+        # bump the collection version once. This is a second round trip after
+        # every article write (pinned in tests/test_article_routes.py) and is
+        # not atomic with it: a process that dies in between leaves the search
+        # statistics off by that write until `flask backfill-articles`
+        # recomputes them from the articles.
+        for changed_id in ids:
+            invalidate_article(changed_id)
+        invalidate_article(id)
+        collection_versions.update_one(
+            {'_id': 'articles'},
+            {'$inc': {'version': 1, **(search_stats or {})}, '$set': {'modified_at': datetime.now()}},
+            upsert=True)
+
+    @staticmethod
+    def search_stats(before: Dict, after: Dict) -> Dict:
+        # Increments to the collection's search statistics for one document
+        # going from `before` to `after` (None for a created/deleted document).
+        stats = {'documents': (after is not None) - (before is not None)}
+        for field in ('title_length', 'body_length'):
+            stats[field] = (after or {}).get(field, 0) - (before or {}).get(field, 0)
+        return stats
+
+    @staticmethod
+    def total_stats(stats: Iterable) -> Dict:
+        totals = {}
+        for document_stats in stats:
+            for key, value in document_stats.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    @staticmethod
+    def get_collection_stamp():
+        db_response = collection_versions.find_one({'_id': 'articles'})
+        return (db_response['version'], db_response['modified_at']) if db_response else (0, None)
+
+    @staticmethod
+    def get_article_stamp(id: str):
+        if not valid_object_id(id):
+            return None
+        db_response = articles.find_one({'_id': ObjectId(id)}, {'created_at': 1, 'updated_at': 1})
+        if not db_response:
+            return None
+        last_modified = db_response.get('updated_at') or db_response.get('created_at')
+        return (f"{id}:{last_modified.isoformat() if last_modified else ''}", last_modified)
 
     @staticmethod
     def get_all_articles(needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response = articles.find()
-        # data = []
-        
-        return Serializer(needed_attributes).dump_find(db_response) if db_response else {}
+        # Documents are already projected and the JSON provider encodes
+        # ObjectId, so list paths skip the per-document Serializer copy.
+        return time_budget.collect(articles.find({}, Serializer.compile(needed_attributes).projection()), 'list')
     
+    @staticmethod
+    def iter_articles(query_values: Dict, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: bool = False) -> Iterator[Dict]:
+        # Yields straight off the cursor; only one batch is held in memory.
+        # Streams are exports and are deliberately not time budgeted.
+        cursor = articles.find(query_values, Serializer.compile(needed_attributes).projection(), batch_size=ARTICLE_STREAM_BATCH_SIZE)
+        if sort:
+            cursor = cursor.sort('_id')
+        yield from cursor
+
     @staticmethod
     def get_article_by_id(id: str,admin_id:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Dict:
         return Article.get_article({'_id': ObjectId(id), 'admin_id': admin_id}, needed_attributes)
@@ -42,9 +154,20 @@ class Article:
     def get_public_article_by_id(id: str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Dict:
         return Article.get_article({'_id': ObjectId(id)}, needed_attributes)
         
+    @staticmethod
+    def get_articles_by_ids(ids: List, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Dict:
+        # One $in query for the whole batch; documents are keyed by string id
+        # and ordering is left to the caller.
+        serializer = Serializer.compile(needed_attributes)
+        projection = dict(serializer.projection(), _id=1)
+        found = {}
+        for document in articles.find({'_id': {'$in': [ObjectId(id) for id in ids]}}, projection):
+            found[str(document['_id'])] = serializer.serialize(document)
+        return found
+
     @staticmethod
     def get_article_by_title(title: str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Dict:
-        return Article.get_article({'title': title}, needed_attributes)
+        return Article.get_article({'title': title}, needed_attributes, TITLE_COLLATION)
 
     @staticmethod
     def get_admin_article(id:str, admin_id:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Dict:
@@ -52,90 +175,464 @@ class Article:
     
     @staticmethod
     def get_admin_articles(admin_id:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response:List = list(articles.find({'admin_id': admin_id}).sort('_id'))
-        return Serializer(needed_attributes).dump(db_response) if db_response else []
-
-    @staticmethod
-    def admin_article_search(admin_id:str, search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response = list(articles.find({'admin_id': admin_id, '$or': [{
-            'body': {
-                '$regex': search_string,
-                "$options": 'i'
-            }},
-            {
-            'title': {
-                '$regex': search_string,
-                "$options": 'i'
+        return time_budget.collect(articles.find({'admin_id': admin_id}, Serializer.compile(needed_attributes).projection()).sort('_id'), 'list')
+
+    @staticmethod
+    def search_query(terms: List, search_target: str = 'article', admin_id: str = None) -> Dict:
+        # Every term must occur; for 'article' each term may come from title or body.
+        if search_target == 'article':
+            query = {'$and': [{'$or': [{'title_terms': term}, {'body_terms': term}]} for term in terms]}
+        else:
+            query = {f'{search_target}_terms': {'$all': terms}}
+        if admin_id:
+            query['admin_id'] = admin_id
+        return query
+
+    @staticmethod
+    def document_frequencies(terms: List, fields: List) -> Dict:
+        # One pass over the articles holding any of the terms, counting per term.
+        def has_term(term):
+            return {'$or': [{'$in': [term, {'$ifNull': [f'${field}_terms', []]}]} for field in fields]}
+        counts = time_budget.aggregate(articles, [
+            {'$match': {'$or': [{f'{field}_terms': {'$in': terms}} for field in fields]}},
+            {'$group': {'_id': None, **{
+                f'term_{index}': {'$sum': {'$cond': [has_term(term), 1, 0]}} for index, term in enumerate(terms)
+            }}}
+        ], 'search', partial=False)
+        counts = counts[0] if counts else {}
+        return {term: counts.get(f'term_{index}', 0) for index, term in enumerate(terms)}
+
+    @staticmethod
+    def rank(terms: List, search_target: str = 'article', admin_id: str = None):
+        # BM25 over the stored token lists, scored server side for every match
+        # so the best SEARCH_MAX_CANDIDATES are kept. Returns (ids, total
+        # matches); ids is shorter than total when the cap cut it.
+        fields = ['title', 'body'] if search_target == 'article' else [search_target]
+        stats = collection_versions.find_one({'_id': 'articles'}) or {}
+        document_count = max(stats.get('documents', 0), 1)
+        idfs = {term: idf(frequency, document_count) for term, frequency in Article.document_frequencies(terms, fields).items()}
+
+        score = {'$add': [
+            {'$multiply': [FIELD_WEIGHTS[field], bm25(field, terms, idfs, stats.get(f'{field}_length', 0) / document_count)]}
+            for field in fields
+        ]}
+        result = time_budget.aggregate(articles, [
+            {'$match': Article.search_query(terms, search_target, admin_id)},
+            {'$project': {'score': score}},
+            {'$facet': {
+                'ranked': [{'$sort': {'score': -1, '_id': -1}}, {'$limit': SEARCH_MAX_CANDIDATES}, {'$project': {'_id': 1}}],
+                'total': [{'$count': 'count'}]
             }}
-        ]}).sort('_id'))
+        ], 'search')
+        if not result:
+            return [], 0
+        ids = [candidate['_id'] for candidate in result[0]['ranked']]
+        total = result[0]['total'][0]['count'] if result[0]['total'] else 0
+        return ids, total
+
+    @staticmethod
+    def substring_ids(search_string: str, search_target: str = 'article', admin_id: str = None, sort: str = 'relevance') -> List:
+        # Case-insensitive "contains" search. Trigram postings narrow the
+        # collection to a few candidates and the server checks each one with an
+        # escaped $regex, so only ids come back. More than SEARCH_MAX_CANDIDATES
+        # matches are cut to the cap and flagged partial.
+        fields = ['title', 'body'] if search_target == 'article' else [search_target]
+        grams = trigrams(search_string)
+        contains = {'$regex': re.escape(search_string), '$options': 'i'}
+        if grams:
+            conditions = [{f'{field}_trigrams': {'$all': grams}, field: contains} for field in fields]
+        else:
+            conditions = [{field: contains} for field in fields]
+        query = {'$or': conditions} if len(conditions) > 1 else conditions[0]
+        if admin_id:
+            query['admin_id'] = admin_id
+
+        order = DESCENDING if sort == 'newest' else ASCENDING
+        candidates = time_budget.collect(
+            articles.find(query, {'_id': 1}).sort('_id', order).limit(SEARCH_MAX_CANDIDATES + 1), 'search')
+        if len(candidates) > SEARCH_MAX_CANDIDATES:
+            time_budget.mark_partial()
+        return [candidate['_id'] for candidate in candidates[:SEARCH_MAX_CANDIDATES]]
 
-        return Serializer(needed_attributes).dump(db_response)
-    
     @staticmethod
-    def article_search(search_string: str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response = list(articles.find({'$or': [{
-            'body': {
-                '$regex': search_string,
-                "$options": 'i'
-            }},
-            {
-            'title': {
-                '$regex': search_string,
-                "$options": 'i'
+    def fuzzy_ids(search_string: str, search_target: str = 'article', admin_id: str = None, sort: str = 'relevance') -> List:
+        # Typo-tolerant search: a document matches when it shares at least
+        # FUZZY_SEARCH_THRESHOLD of the query's trigrams.
+        fields = ['title', 'body'] if search_target == 'article' else [search_target]
+        grams = trigrams(search_string)
+        if not grams:
+            return []
+        required = max(1, ceil(len(grams) * FUZZY_SEARCH_THRESHOLD))
+        # A document sharing `required` of the grams must hold at least one of
+        # any len(grams) - required + 1 of them, so the $in only needs that many.
+        postings = grams[:len(grams) - required + 1]
+        query = {'$or': [{f'{field}_trigrams': {'$in': postings}} for field in fields]}
+        if admin_id:
+            query['admin_id'] = admin_id
+
+        matched = {'$max': [
+            {'$size': {'$setIntersection': [{'$ifNull': [f'${field}_trigrams', []]}, grams]}} for field in fields
+        ]}
+        # Common trigrams can still match most of the collection, so at most
+        # SEARCH_MAX_SCANNED candidates (newest first) are compared; a search
+        # that hits either cap is flagged partial.
+        result = time_budget.aggregate(articles, [
+            {'$match': query},
+            {'$sort': {'_id': -1}},
+            {'$limit': SEARCH_MAX_SCANNED + 1},
+            {'$facet': {
+                'scanned': [{'$count': 'count'}],
+                'matches': [
+                    {'$limit': SEARCH_MAX_SCANNED},
+                    {'$project': {'matched': matched}},
+                    {'$match': {'matched': {'$gte': required}}},
+                    {'$sort': {'_id': -1} if sort == 'newest' else {'matched': -1, '_id': -1}},
+                    {'$limit': SEARCH_MAX_CANDIDATES + 1},
+                    {'$project': {'_id': 1}}
+                ]
             }}
-        ]}).sort('_id'))
+        ], 'search')
+        if not result:
+            return []
+        scanned = result[0]['scanned'][0]['count'] if result[0]['scanned'] else 0
+        matches = result[0]['matches']
+        if scanned > SEARCH_MAX_SCANNED or len(matches) > SEARCH_MAX_CANDIDATES:
+            time_budget.mark_partial()
+        return [candidate['_id'] for candidate in matches[:SEARCH_MAX_CANDIDATES]]
+
+    @staticmethod
+    def get_articles_in_order(ids: List, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], kind: str = 'search') -> List:
+        projection = dict(Serializer.compile(needed_attributes).projection(), _id=1)
+        found = {document['_id']: document for document in time_budget.collect(articles.find({'_id': {'$in': ids}}, projection), kind)}
+        documents = [found[id] for id in ids if id in found]
+        if '_id' not in needed_attributes:
+            for document in documents:
+                del document['_id']
+        return documents
+
+    @staticmethod
+    def search(search_string: str, search_target: str = 'article', admin_id: str = None, sort: str = 'relevance', needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], match: str = 'words') -> List:
+        if match == 'substring':
+            return Article.get_articles_in_order(Article.substring_ids(search_string, search_target, admin_id, sort), needed_attributes)
+        if match == 'fuzzy':
+            return Article.get_articles_in_order(Article.fuzzy_ids(search_string, search_target, admin_id, sort), needed_attributes)
 
-        return Serializer(needed_attributes).dump(db_response)
+        terms = query_terms(search_string)
+        if not terms:
+            return []
+        if sort == 'newest':
+            query = Article.search_query(terms, search_target, admin_id)
+            return time_budget.collect(articles.find(query, Serializer.compile(needed_attributes).projection()).sort('_id', DESCENDING), 'search')
+        ids, total = Article.rank(terms, search_target, admin_id)
+        if total > len(ids):
+            time_budget.mark_partial()
+        return Article.get_articles_in_order(ids, needed_attributes)
+
+    @staticmethod
+    def admin_article_search(admin_id:str, search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: str = 'relevance', match: str = 'words') -> List:
+        return Article.search(search_string, 'article', admin_id, sort, needed_attributes, match)
     
     @staticmethod
-    def admin_title_search(admin_id:str, search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response = list(articles.find({'admin_id': admin_id,'title': {'$regex': search_string,"$options": 'i'}}).sort('_id'))
-        return Serializer(needed_attributes).dump(db_response)
+    def article_search(search_string: str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: str = 'relevance', match: str = 'words') -> List:
+        return Article.search(search_string, 'article', None, sort, needed_attributes, match)
     
     @staticmethod
-    def title_search(search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response = list(articles.find({'title': {'$regex': search_string,"$options": 'i'}}).sort('_id'))
-        return Serializer(needed_attributes).dump(db_response)
+    def admin_title_search(admin_id:str, search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: str = 'relevance', match: str = 'words') -> List:
+        return Article.search(search_string, 'title', admin_id, sort, needed_attributes, match)
+    
+    @staticmethod
+    def title_search(search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: str = 'relevance', match: str = 'words') -> List:
+        return Article.search(search_string, 'title', None, sort, needed_attributes, match)
 
     @staticmethod
-    def admin_body_search(admin_id:str, search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response = list(articles.find({'admin_id': admin_id,'body': {'$regex': search_string,"$options": 'i'}}).sort('_id'))
-        return Serializer(needed_attributes).dump(db_response)
+    def admin_body_search(admin_id:str, search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: str = 'relevance', match: str = 'words') -> List:
+        return Article.search(search_string, 'body', admin_id, sort, needed_attributes, match)
 
     @staticmethod
-    def body_search(search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> List:
-        db_response = list(articles.find({'body': {'$regex': search_string,"$options": 'i'}}).sort('_id'))
-        return Serializer(needed_attributes).dump(db_response)
-    
+    def body_search(search_string:str, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: str = 'relevance', match: str = 'words') -> List:
+        return Article.search(search_string, 'body', None, sort, needed_attributes, match)
+
+    @staticmethod
+    def suggest_titles(prefix: str, limit: int = 10, admin_id: str = None) -> List:
+        # Anchored range scan on the normalized title index; only _id and title are read.
+        key = title_key(prefix)
+        if not key:
+            return []
+        query = {'title_normalized': {'$gte': key, '$lt': key + '\U0010ffff'}}
+        if admin_id:
+            query['admin_id'] = admin_id
+        return time_budget.collect(articles.find(query, {'_id': 1, 'title': 1}).sort('title_normalized').limit(limit), 'search')
+
+    @staticmethod
+    def paginate(query_values: Dict, page: int, limit: int, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], order: int = ASCENDING, kind: str = 'list') -> Pagination:
+        # The page is a plain skip/limit find sorted on _id and the total an
+        # index-backed count; neither has to fit the whole result set in one
+        # document. A page cut short by its time budget is flagged partial, a
+        # count that runs out of time raises QueryBudgetExceeded.
+        skip, limit = Pagination.offsets(page, limit)
+        cursor = articles.find(query_values, Serializer.compile(needed_attributes).projection()).sort('_id', order).skip(skip).limit(limit)
+        data = time_budget.collect(cursor, kind)
+        total = time_budget.count(articles, query_values, kind)
+        return Pagination(data, page, limit, total)
+
     @staticmethod
-    def update_article(id:str,admin_id:str,query_values:Dict) -> bool:
-        query_values['updated_at'] = datetime.now()
-        db_response = articles.update_one(
-            {'_id': ObjectId(id), 'admin_id': admin_id}, {'$set': query_values})
-        return True if db_response.raw_result['nModified'] == 1 else False
+    def paginate_articles(page: int, limit: int, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Pagination:
+        return Article.paginate({}, page, limit, needed_attributes)
+
+    @staticmethod
+    def paginate_admin_articles(admin_id: str, page: int, limit: int, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Pagination:
+        return Article.paginate({'admin_id': admin_id}, page, limit, needed_attributes)
+
+    @staticmethod
+    def paginate_search(search_string: str, search_target: str, page: int, limit: int, admin_id: str = None, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at'], sort: str = 'relevance', match: str = 'words') -> Pagination:
+        if match == 'substring':
+            ids = Article.substring_ids(search_string, search_target, admin_id, sort)
+            total = len(ids)
+        elif match == 'fuzzy':
+            ids = Article.fuzzy_ids(search_string, search_target, admin_id, sort)
+            total = len(ids)
+        else:
+            terms = query_terms(search_string)
+            if not terms:
+                return Pagination([], page, limit, 0)
+            if sort == 'newest':
+                return Article.paginate(Article.search_query(terms, search_target, admin_id), page, limit, needed_attributes, DESCENDING, 'search')
+            ids, total = Article.rank(terms, search_target, admin_id)
+
+        # total counts every match; pages past the ranked candidates are
+        # flagged partial rather than silently coming back empty or short.
+        skip, limit = Pagination.offsets(page, limit)
+        if skip + limit > len(ids) and total > len(ids):
+            time_budget.mark_partial()
+        return Pagination(Article.get_articles_in_order(ids[skip:skip + limit], needed_attributes), page, limit, total)
+
+    @staticmethod
+    def cursor_page(query_values: Dict, cursor: str = None, limit: int = 10, needed_attributes=['_id', 'title', 'body', 'image_url', 'created_at', 'updated_at']) -> Dict:
+        # Keyset pagination on _id: every page is an index range scan, so the
+        # cost does not grow with page depth. Raises ValueError for a bad cursor.
+        _, limit = Pagination.normalize(1, limit)
+        direction, boundary = decode_cursor(cursor) if cursor else (NEXT, None)
+        query = dict(query_values)
+        if boundary:
+            query['_id'] = {'$gt': boundary} if direction == NEXT else {'$lt': boundary}
+
+        order = ASCENDING if direction == NEXT else DESCENDING
+        serializer = Serializer.compile(needed_attributes)
+        # _id is always fetched because the cursors are built from it.
+        projection = dict(serializer.projection(), _id=1)
+        db_response = time_budget.collect(articles.find(query, projection).sort('_id', order).limit(limit + 1), 'list')
+        # A partial page still ends at a real document, so the cursors stay valid.
+        has_more = len(db_response) > limit or (time_budget.is_partial() and bool(db_response))
+        db_response = db_response[:limit]
+        if direction == PREV:
+            db_response.reverse()
+
+        next_cursor = prev_cursor = None
+        if db_response:
+            has_next = has_more if direction == NEXT else True
+            has_prev = boundary is not None if direction == NEXT else has_more
+            next_cursor = encode_cursor(NEXT, db_response[-1]['_id']) if has_next else None
+            prev_cursor = encode_cursor(PREV, db_response[0]['_id']) if has_prev else None
+
+        return {
+            'data': serializer.dump(db_response),
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor,
+            'page_data_length': len(db_response)
+        }
+
+    @staticmethod
+    def derived_values(query_values: Dict) -> Dict:
+        # The submitted fields plus everything stored alongside them.
+        values = dict(query_values)
+        if 'body' in values:
+            values.update(summarize(values['body']))
+            values.update(field_terms('body', values['body']))
+        if 'title' in values:
+            values.update(field_terms('title', values['title']))
+            values['title_normalized'] = title_key(values['title'])
+        return values
+
+    @staticmethod
+    def update_article(id:str,admin_id:str,query_values:Dict) -> WriteOutcome:
+        # One pipeline update: every field is set as a literal and updated_at only
+        # moves when a submitted value differs, so the BEFORE image tells us
+        # whether anything changed. Bodies are compared by hash, so the old body
+        # never comes back over the wire. A taken title surfaces as CONFLICT.
+        from pymongo.errors import DuplicateKeyError
+        if not valid_object_id(id):
+            return WriteOutcome.NOT_FOUND
+        values = Article.derived_values(query_values)
+        compared = [COMPARED_FIELDS.get(key, key) for key in query_values]
+        unchanged = {'$and': [{'$eq': [f"${field}", {'$literal': values[field]}]} for field in compared]}
+        stage = {key: {'$literal': value} for key, value in values.items()}
+        stage['updated_at'] = {'$cond': [unchanged, '$updated_at', {'$literal': datetime.now()}]}
+        projection = {'title_length': 1, 'body_length': 1, **{field: 1 for field in compared}}
+        try:
+            db_response = articles.find_one_and_update(
+                {'_id': ObjectId(id), 'admin_id': admin_id}, [{'$set': stage}], projection=projection)
+        except DuplicateKeyError:
+            return WriteOutcome.CONFLICT
+        if db_response is None:
+            return WriteOutcome.NOT_FOUND
+        if all(field in db_response and db_response[field] == values[field] for field in compared):
+            return WriteOutcome.UNCHANGED
+        Article.articles_changed(id, Article.search_stats(db_response, {**db_response, **values}))
+        return WriteOutcome.MODIFIED
     
     @staticmethod
-    def admin_update_body(id:str, admin_id:str,body:str) -> bool:
+    def admin_update_body(id:str, admin_id:str,body:str) -> WriteOutcome:
         return Article.update_article(id,admin_id,{'body':body})
 
     @staticmethod
-    def admin_update_title(id: str, admin_id: str, title: str) -> bool:
+    def admin_update_title(id: str, admin_id: str, title: str) -> WriteOutcome:
         return Article.update_article(id, admin_id, {'title': title})
 
     @staticmethod
-    def admin_update_article(id:str, admin_id:str,title:str,body:str,image_url:str) -> bool:
+    def admin_update_article(id:str, admin_id:str,title:str,body:str,image_url:str) -> WriteOutcome:
         return Article.update_article(id, admin_id, {'body': body, 'title': title, 'image_url': image_url})
 
     @staticmethod
-    def admin_update_image_url(id: str, admin_id: str, image_url: str) -> bool:
+    def admin_update_image_url(id: str, admin_id: str, image_url: str) -> WriteOutcome:
         return Article.update_article(id, admin_id, {'image_url': image_url})
     
     @staticmethod
-    def admin_delete_image_url(id: str, admin_id: str):
+    def admin_delete_image_url(id: str, admin_id: str) -> WriteOutcome:
         return Article.update_article(id, admin_id, {'image_url': None})
     
     @staticmethod
-    def admin_delete_article(id: str, admin_id: str):
-        db_response = articles.find_one_and_delete({'_id': ObjectId(id),'admin_id':admin_id})
-        return True if db_response else False   
+    def admin_delete_article(id: str, admin_id: str) -> WriteOutcome:
+        if not valid_object_id(id):
+            return WriteOutcome.NOT_FOUND
+        db_response = articles.find_one_and_delete(
+            {'_id': ObjectId(id),'admin_id':admin_id}, {'title_length': 1, 'body_length': 1})
+        if db_response is None:
+            return WriteOutcome.NOT_FOUND
+        Article.articles_changed(id, Article.search_stats(db_response, None))
+        return WriteOutcome.DELETED
+
+    @staticmethod
+    def owned_articles(ids: List, admin_id: str, fields: Iterable = ()) -> Dict:
+        projection = {'title_length': 1, 'body_length': 1, **{field: 1 for field in fields}}
+        return {str(document['_id']): document for document in
+                articles.find({'_id': {'$in': [ObjectId(id) for id in ids]}, 'admin_id': admin_id}, projection)}
+
+    @staticmethod
+    def admin_bulk_delete(ids: List, admin_id: str) -> Dict:
+        # One read for ownership and search statistics, then one bulk_write.
+        from pymongo import DeleteOne
+        owned = Article.owned_articles(ids, admin_id)
+        if owned:
+            result = articles.bulk_write([DeleteOne({'_id': ObjectId(id), 'admin_id': admin_id}) for id in owned], ordered=False)
+            if result.deleted_count == len(owned):
+                Article.articles_changed(None, Article.total_stats(Article.search_stats(document, None) for document in owned.values()), list(owned))
+            else:
+                # Another request deleted some of them in between and already
+                # counted them; which ones is unknown, so recount instead.
+                Article.articles_changed(None, None, list(owned))
+                Article.recount_search_stats()
+        return {id: WriteOutcome.DELETED if id in owned else WriteOutcome.NOT_FOUND for id in ids}
+
+    @staticmethod
+    def admin_bulk_update(changes: Dict, admin_id: str) -> Dict:
+        # changes maps article id to the fields to set on it. Articles the admin
+        # doesn't own are NOT_FOUND, and ones already holding the values are
+        # UNCHANGED without being written (bodies are compared by hash, so the
+        # read never carries them); the rest go out in one unordered bulk_write,
+        # where a taken title fails only its own article (CONFLICT).
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+        compared = {COMPARED_FIELDS.get(field, field) for values in changes.values() for field in values}
+        owned = Article.owned_articles(changes, admin_id, compared)
+        outcomes, operations, targets = {}, [], []
+        now = datetime.now()
+        for id, query_values in changes.items():
+            before = owned.get(id)
+            values = Article.derived_values(query_values)
+            if before is None:
+                outcomes[id] = WriteOutcome.NOT_FOUND
+            elif all(field in before and before[field] == values[field]
+                     for field in (COMPARED_FIELDS.get(key, key) for key in query_values)):
+                outcomes[id] = WriteOutcome.UNCHANGED
+            else:
+                values['updated_at'] = now
+                operations.append(UpdateOne({'_id': ObjectId(id), 'admin_id': admin_id}, {'$set': values}))
+                targets.append((id, before, values))
 
+        bulk_error = None
+        matched = 0
+        if operations:
+            try:
+                matched = articles.bulk_write(operations, ordered=False).matched_count
+            except BulkWriteError as error:
+                bulk_error = error
+                matched = error.details.get('nMatched', 0)
+        write_errors = bulk_error.details.get('writeErrors', []) if bulk_error else []
+        failed = {write_error['index'] for write_error in write_errors}
+
+        modified = [target for index, target in enumerate(targets) if index not in failed]
+        if matched < len(modified):
+            # Some articles were deleted between the read and the write; their
+            # statistics went with the delete, so they are NOT_FOUND here.
+            remaining = Article.owned_articles([id for id, _, _ in modified], admin_id)
+            for id, _, _ in modified:
+                if id not in remaining:
+                    outcomes[id] = WriteOutcome.NOT_FOUND
+            modified = [target for target in modified if target[0] in remaining]
+        if modified:
+            Article.articles_changed(
+                None, Article.total_stats(Article.search_stats(before, {**before, **values}) for _, before, values in modified),
+                [id for id, _, _ in modified])
+        for id, _, _ in modified:
+            outcomes[id] = WriteOutcome.MODIFIED
+
+        for write_error in write_errors:
+            if write_error.get('code') != 11000:
+                raise bulk_error
+            outcomes[targets[write_error['index']][0]] = WriteOutcome.CONFLICT
+        return {id: outcomes[id] for id in changes}
+
+    @staticmethod
+    def admin_bulk_delete_image_url(ids: List, admin_id: str) -> Dict:
+        return Article.admin_bulk_update({id: {'image_url': None} for id in ids}, admin_id)
+
+    @staticmethod
+    def backfill_derived_fields(batch_size: int = 500) -> int:
+        # Computes the summary and search fields for articles written before
+        # they existed, then recomputes the collection's search statistics.
+        from pymongo import UpdateOne
+        updated = 0
+        batch = []
+        missing = {'$or': [
+            {'word_count': {'$exists': False}},
+            {'body_hash': {'$exists': False}},
+            {'body_trigrams': {'$exists': False}},
+            {'title_normalized': {'$exists': False}}
+        ]}
+        for document in articles.find(missing, {'title': 1, 'body': 1}, batch_size=batch_size):
+            body = document.get('body') or ''
+            derived = {**summarize(body), **search_fields(document.get('title') or '', body)}
+            batch.append(UpdateOne({'_id': document['_id']}, {'$set': derived}))
+            if len(batch) == batch_size:
+                updated += articles.bulk_write(batch, ordered=False).modified_count
+                batch = []
+        if batch:
+            updated += articles.bulk_write(batch, ordered=False).modified_count
+
+        Article.recount_search_stats()
+        Article.articles_changed()
+        return updated
+
+    @staticmethod
+    def recount_search_stats():
+        # Recomputes the document count and total lengths from the articles,
+        # replacing whatever increments have accumulated.
+        totals = list(articles.aggregate([{'$group': {
+            '_id': None,
+            'documents': {'$sum': 1},
+            'title_length': {'$sum': '$title_length'},
+            'body_length': {'$sum': '$body_length'}
+        }}]))
+        stats = {key: value for key, value in (totals[0] if totals else {}).items() if key != '_id'}
+        stats = {'documents': 0, 'title_length': 0, 'body_length': 0, **stats}
+        collection_versions.update_one({'_id': 'articles'}, {'$set': stats}, upsert=True)
@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class WriteOutcome(Enum):
+    """Result of a single-document write, decided from one round trip."""
+
+    NOT_FOUND = 'not_found'
+    UNCHANGED = 'unchanged'
+    MODIFIED = 'modified'
+    DELETED = 'deleted'
+    CONFLICT = 'conflict'
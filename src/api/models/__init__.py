@@ -1,5 +1,19 @@
-from pymongo import MongoClient
-from src.config import MONGODB_URI
+import os
+from src.config import (MONGODB_DATABASE, MONGODB_URI, MONGO_CONNECT_TIMEOUT_MS, MONGO_MAX_IDLE_TIME_MS, MONGO_MAX_POOL_SIZE,
+                        MONGO_MIN_POOL_SIZE, MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_WAIT_QUEUE_TIMEOUT_MS)
+from .connection import Connection, LazyDatabase
 
-mongo = MongoClient(MONGODB_URI)
-db = mongo.chichi_blog_db
+# Nothing connects at import time; the client is created per process on first use.
+connection = Connection(
+    MONGODB_URI,
+    MONGODB_DATABASE,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS
+)
+db = LazyDatabase(connection)
+
+os.register_at_fork(after_in_child=connection.reset)
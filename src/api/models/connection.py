@@ -0,0 +1,136 @@
+import logging
+import os
+from threading import Lock
+from typing import Dict
+
+
+class Connection:
+    """Owns this process's MongoClient, created on first use.
+
+    A client must not be shared across fork, so the client is tied to the pid
+    that created it: a forked worker (gunicorn --preload) drops the inherited
+    reference and connects on its own the first time it needs the database.
+    pymongo itself is imported then too, keeping it off the import path of the
+    app. Callbacks added with on_connect run once for every client created.
+    """
+
+    def __init__(self, uri: str, database: str, **options):
+        self.uri = uri
+        self.database_name = database
+        self.options = {key: value for key, value in options.items() if value is not None}
+        self.pool_stats = None
+        self.callbacks = []
+        self.listeners = []
+        self.__client = None
+        self.__pid = None
+        self.__lock = Lock()
+
+    def add_listener(self, factory):
+        # factory() builds a pymongo event listener when the client is created.
+        if factory not in self.listeners:
+            self.listeners.append(factory)
+
+    def on_connect(self, callback):
+        if callback not in self.callbacks:
+            self.callbacks.append(callback)
+
+    def client(self):
+        client = self.__client
+        if client is not None and self.__pid == os.getpid():
+            return client
+        with self.__lock:
+            if self.__client is not None and self.__pid == os.getpid():
+                return self.__client
+            from pymongo import MongoClient
+            from .pool_stats import PoolStats
+            self.pool_stats = PoolStats()
+            listeners = [self.pool_stats] + [factory() for factory in self.listeners]
+            client = MongoClient(self.uri, event_listeners=listeners, **self.options)
+            self.__client = client
+            self.__pid = os.getpid()
+        # Outside the lock: callbacks use the database themselves. A failing
+        # callback is logged rather than failing the request that connected.
+        for callback in self.callbacks:
+            try:
+                callback()
+            except Exception:
+                logging.getLogger(__name__).exception("on_connect callback %s failed", callback.__name__)
+        return client
+
+    def database(self):
+        return self.client()[self.database_name]
+
+    def reset(self):
+        # Called in a forked child; the parent's client and its sockets belong
+        # to the parent, so only the reference is dropped.
+        self.__client = None
+        self.__pid = None
+        self.__lock = Lock()
+        self.pool_stats = None
+
+    def close(self):
+        with self.__lock:
+            if self.__client is not None and self.__pid == os.getpid():
+                self.__client.close()
+            self.__client = None
+            self.__pid = None
+
+    def warm_up(self):
+        """Selects a server and opens a first connection before traffic arrives.
+
+        With minPoolSize set, the driver fills the rest of the pool in the
+        background from here.
+        """
+        self.client().admin.command('ping')
+
+    @property
+    def connected(self) -> bool:
+        return self.__client is not None and self.__pid == os.getpid()
+
+    def stats(self) -> Dict:
+        pool = self.pool_stats
+        if pool is None or not self.connected:
+            return {'connected': False, 'pid': os.getpid()}
+        max_pool_size = self.options.get('maxPoolSize', 100)
+        return {
+            'connected': self.connected,
+            'pid': os.getpid(),
+            'max_pool_size': max_pool_size,
+            'min_pool_size': self.options.get('minPoolSize', 0),
+            'open': pool.open,
+            'in_use': pool.in_use,
+            'peak_in_use': pool.peak_in_use,
+            'waiting': pool.waiting,
+            'utilization': round(pool.in_use / max_pool_size, 3) if max_pool_size else None,
+            'checkouts': pool.checkouts,
+            'checkout_failures': pool.checkout_failures,
+            'created': pool.created,
+            'closed': pool.closed,
+            'cleared': pool.cleared
+        }
+
+
+class LazyCollection:
+    """Collection handle that resolves against the current process's client.
+
+    Lets models keep module-level handles (`articles = db.articles`) without
+    connecting at import time.
+    """
+
+    def __init__(self, connection: Connection, name: str):
+        self.__connection = connection
+        self.__name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self.__connection.database()[self.__name], attribute)
+
+
+class LazyDatabase:
+    def __init__(self, connection: Connection):
+        self.__connection = connection
+
+    def __getattr__(self, name: str) -> LazyCollection:
+        return LazyCollection(self.__connection, name)
+
+    def __getitem__(self, name: str) -> LazyCollection:
+        return LazyCollection(self.__connection, name)
@@ -0,0 +1,33 @@
+from . import db
+
+# Case-insensitive comparison for article titles; queries on title must pass
+# the same collation to be answered by the unique index.
+TITLE_COLLATION = {'locale': 'en', 'strength': 2}
+
+
+def index_models() -> dict:
+    # Built on demand so that importing the models doesn't import pymongo.
+    from pymongo import ASCENDING, IndexModel
+    return {
+        'articles': [
+            IndexModel([('admin_id', ASCENDING), ('_id', ASCENDING)], name='admin_id_id'),
+            IndexModel([('title', ASCENDING)], name='title_unique', unique=True, collation=TITLE_COLLATION),
+            IndexModel([('title_terms', ASCENDING)], name='title_terms'),
+            IndexModel([('body_terms', ASCENDING)], name='body_terms'),
+            IndexModel([('title_trigrams', ASCENDING)], name='title_trigrams'),
+            IndexModel([('title_normalized', ASCENDING)], name='title_normalized'),
+            IndexModel([('admin_id', ASCENDING), ('title_normalized', ASCENDING)], name='admin_id_title_normalized'),
+            IndexModel([('body_trigrams', ASCENDING)], name='body_trigrams'),
+        ],
+        'admins': [
+            IndexModel([('email', ASCENDING)], name='email_unique', unique=True),
+            IndexModel([('type', ASCENDING)], name='type'),
+        ],
+    }
+
+
+def ensure_indexes() -> list:
+    created = []
+    for collection, indexes in index_models().items():
+        created.extend(db[collection].create_indexes(indexes))
+    return created
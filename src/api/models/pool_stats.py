@@ -0,0 +1,72 @@
+from threading import Lock, local
+from pymongo.monitoring import ConnectionPoolListener
+
+# How long this thread last waited to check out a connection, in seconds.
+checkout_wait = local()
+
+
+class PoolStats(ConnectionPoolListener):
+    """Counts connection pool events for this process's client."""
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self.__lock:
+            self.open = 0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.waiting = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.created = 0
+            self.closed = 0
+            self.cleared = 0
+
+    def connection_created(self, event):
+        with self.__lock:
+            self.created += 1
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self.__lock:
+            self.closed += 1
+            self.open -= 1
+
+    def connection_check_out_started(self, event):
+        with self.__lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event):
+        with self.__lock:
+            self.waiting -= 1
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        checkout_wait.seconds = event.duration
+        with self.__lock:
+            self.waiting -= 1
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def connection_checked_in(self, event):
+        with self.__lock:
+            self.in_use -= 1
+
+    def pool_cleared(self, event):
+        with self.__lock:
+            self.cleared += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
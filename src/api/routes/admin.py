@@ -1,11 +1,12 @@
 from flask import Blueprint,jsonify,request
 from typing import Dict
-from werkzeug.security import generate_password_hash,check_password_hash
 from src.config import DEFAULT_MAIN_ADMIN_PASS
 from src.api.models.Admin import Admin
 from flask_jwt_extended import create_access_token,create_refresh_token,jwt_required,get_jwt_identity
-import validators
+from src.modules.identity_cache import current_admin as get_current_admin
 from src.modules.valid_object_id import valid_object_id
+from src.modules.valid_email import valid_email
+from src.modules.password_hasher import HashingUnavailable,hash_password,verify_password,needs_rehash
 
 
 admin = Blueprint("admin",__name__,url_prefix="/api/admin")   
@@ -24,8 +25,13 @@ def login():
     current_admin = Admin.get_admin_by_email(email.strip())
 
     if current_admin:
-        valid_password = check_password_hash(current_admin['password'],password)
+        valid_password = verify_password(current_admin['password'],password)
         if valid_password:
+            if needs_rehash(current_admin['password']):
+                try:
+                    Admin.rehash_password(current_admin['_id'],current_admin['password'],hash_password(password))
+                except HashingUnavailable:
+                    pass
             access_token = create_access_token(identity=current_admin['_id'])
             refresh_token = create_refresh_token(identity=current_admin['_id'])
             data = {
@@ -85,26 +91,29 @@ def create_admin():
                 'message': "password length is less than 5"
             }), 400
         
-        if not validators.email(email):
+        if not valid_email(email):
             return jsonify({
                 'error':True,
                 'message':"invalid email"
             }), 400
         
-        if Admin.get_admin_by_email(email):
+        password_hash = hash_password(password)
+        from pymongo.errors import DuplicateKeyError
+
+        try:
+            created = Admin.create_admin({
+                'name': name,
+                'password': password_hash,
+                'email': email,
+                'type': "sub"
+            })
+        except DuplicateKeyError:
             return jsonify({
                 'error': True,
                 'message': "email already exists"
             }), 400
-        
-        password_hash = generate_password_hash(password)
-        
-        if Admin.create_admin({
-            'name': name,
-            'password': password_hash,
-            'email': email,
-            'type': "sub"
-        }):
+
+        if created:
             return jsonify({
                 'error': False,
                 'message': "admin created successfully"
@@ -133,7 +142,7 @@ def update_admin_password():
 
     password = request.get_json().get('password',None)
     new_password = request.get_json().get('new_password',None)
-    current_admin = Admin.get_admin_by_id(admin_id)
+    current_admin = get_current_admin()
 
     if not current_admin:
         return jsonify({
@@ -147,7 +156,10 @@ def update_admin_password():
             'message': "all values needed"
         }),400
 
-    valid_password = check_password_hash(current_admin['password'], password)
+    # Checked against the stored hash, never a cached copy, so a password
+    # changed through another worker stops working straight away.
+    stored = Admin.get_admin_by_id(admin_id, ['password'])
+    valid_password = bool(stored) and verify_password(stored['password'], password)
 
     if valid_password:
         if len(new_password) < 5:
@@ -156,7 +168,7 @@ def update_admin_password():
                 'message': "password length is less than 5"
             }), 400
         
-        password_hash = generate_password_hash(new_password)
+        password_hash = hash_password(new_password)
 
         if Admin.update_admin_password(admin_id,password_hash):
             return jsonify({
@@ -187,7 +199,7 @@ def update_admin_email():
         }), 401
 
     new_email = request.get_json().get('new_email', None)
-    current_admin = Admin.get_admin_by_id(admin_id)
+    current_admin = get_current_admin()
 
     if not new_email:
         return jsonify({
@@ -201,14 +213,17 @@ def update_admin_email():
             'message': "admin does not exists"
         }), 401
 
-    if Admin.get_admin_by_email(new_email):
-        return jsonify({
-            'error': False,
-            'message': "email already in use"
-        }), 400
+    if valid_email(new_email):
+        from pymongo.errors import DuplicateKeyError
+        try:
+            updated = Admin.update_admin_email(admin_id,new_email)
+        except DuplicateKeyError:
+            return jsonify({
+                'error': False,
+                'message': "email already in use"
+            }), 400
 
-    if validators.email(new_email):
-        if Admin.update_admin_email(admin_id,new_email):
+        if updated:
             return jsonify({
                 'error': False,
                 'message': "email has been updated successfully"
@@ -243,7 +258,7 @@ def update_admin_name():
             'message': "new name required"
         }),400
 
-    current_admin = Admin.get_admin_by_id(admin_id)
+    current_admin = get_current_admin()
     
     if not current_admin:
         return jsonify({
@@ -273,7 +288,7 @@ def update_admin_name():
 @jwt_required(refresh=True)
 def admin_token():
     admin_id = get_jwt_identity()
-    admin = Admin.get_admin_by_id(admin_id)
+    admin = get_current_admin()
 
     if admin:
         token = create_access_token(identity=admin_id)
@@ -1,10 +1,17 @@
-from flask import Blueprint, jsonify, request
-from typing import Dict, List
-from src.api.models.Article import Article
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from bson.objectid import ObjectId
+from typing import Dict, Iterable, List
+from src.api.models.Article import Article, ARTICLE_ATTRIBUTES, ARTICLE_VIEWS
+from src.api.models.WriteOutcome import WriteOutcome
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.config import ARTICLE_IMPORT_BATCH_SIZE, BULK_MAX_IDS, SUGGEST_MAX_LIMIT
 from src.modules.valid_object_id import valid_object_id
+from src.modules.field_selection import field_selection
+from src.modules.time_budget import partial_flag
+from src.modules.search import SEARCH_MATCHES, SEARCH_SORTS, SEARCH_TARGETS
+from src.modules.streaming import STREAM_FORMATS, gzip_chunks, ndjson_lines, stream_documents
+from src.modules.article_validation import article_error
 from src.modules.response import response
-from src.modules.Pagination import Pagination
 
 article = Blueprint("article", __name__, url_prefix="/api/article")
 
@@ -24,36 +31,28 @@ def create_article():
     body = request.get_json().get('body', None)
     image_url = request.get_json().get('image_url', None)
 
-    if not title or not body:
+    error = article_error(title, body)
+    if error:
         return jsonify({
             'error': True,
-            'message': "title and body required"
+            'message': error
         }), 400
 
-    if len(title) < 3:
-        return jsonify({
-            'error': True,
-            'message': "title length must be greater than 2"
-        }), 400
-
-    if len(body) < 3:
-        return jsonify({
-            'error': True,
-            'message': "body length must be greater than 2"
-        }), 400
-
-    if Article.get_article_by_title(title):
+    from pymongo.errors import DuplicateKeyError
+    try:
+        created = Article.create_article({
+            'title': title,
+            'body': body,
+            'image_url': image_url,
+            'admin_id': identity
+        })
+    except DuplicateKeyError:
         return jsonify({
             'error': True,
             'message': "an article with this title already exists"
         }), 400
 
-    if Article.create_article({
-        'title': title,
-        'body': body,
-        'image_url': image_url,
-        'admin_id': identity
-    }):
+    if created:
         return jsonify({
             'error': False,
             'message': "article created successfully"
@@ -101,9 +100,22 @@ def get_article():
             'message': "access token needed"
         }), 401
 
-    data: List = Article.get_admin_articles(admin_id)
+    format = request.args.get('format', 'json')
+
+    if format not in STREAM_FORMATS:
+        return jsonify({'error': True, 'message': "format must be json, ndjson or stream"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    if format != 'json':
+        return stream_documents(Article.iter_articles({'admin_id': admin_id}, needed_attributes, True), format)
 
-    return jsonify({'error': False, 'data': data}), 200
+    data: List = Article.get_admin_articles(admin_id, needed_attributes)
+
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @article.get("/pagination/article-pagination")
@@ -123,10 +135,68 @@ def article_pagination():
     except Exception:
         return jsonify({'error': True, 'message': "page and limit must be an integer"}), 400
 
-    paginate = Pagination(Article.get_admin_articles(
-        admin_id), page, limit).meta_data()
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    paginate = Article.paginate_admin_articles(admin_id, page, limit, needed_attributes).meta_data()
+
+    return jsonify({'error': False, 'data': paginate, **partial_flag()}), 200
+
+
+@article.get("/pagination/article-cursor")
+@jwt_required()
+def article_cursor_pagination():
+    admin_id = get_jwt_identity()
+
+    if not valid_object_id(admin_id):
+        return jsonify({
+            'error': True,
+            'message': "access token needed"
+        }), 401
+
+    try:
+        limit = int(request.args.get('limit', 10))
+    except Exception:
+        return jsonify({'error': True, 'message': "limit must be an integer"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    try:
+        paginate = Article.cursor_page({'admin_id': admin_id}, request.args.get('cursor', None), limit, needed_attributes)
+    except ValueError:
+        return jsonify({'error': True, 'message': "invalid cursor"}), 400
+
+    return jsonify({'error': False, 'data': paginate, **partial_flag()}), 200
+
+
+@article.get("/suggest")
+@jwt_required()
+def suggest():
+    admin_id = get_jwt_identity()
+
+    if not valid_object_id(admin_id):
+        return jsonify({
+            'error': True,
+            'message': "access token needed"
+        }), 401
+
+    prefix = request.args.get('prefix', None)
+
+    if not prefix:
+        return jsonify({'error': True, 'message': "prefix needed"}), 400
+
+    try:
+        limit = int(request.args.get('limit', 10))
+    except Exception:
+        return jsonify({'error': True, 'message': "limit must be an integer"}), 400
 
-    return jsonify({'error': False, 'data': paginate}), 200
+    data = Article.suggest_titles(prefix, min(max(limit, 1), SUGGEST_MAX_LIMIT), admin_id)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @article.get("/search")
@@ -144,8 +214,23 @@ def article_search():
     if not search_string:
         return jsonify({'error': True, 'message': "search-string needed"}), 400
 
-    data = Article.admin_article_search(admin_id, search_string)
-    return jsonify({'error': False, 'data': data}), 200
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    data = Article.admin_article_search(admin_id, search_string, needed_attributes, sort, match)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @article.get("/search/title")
@@ -163,8 +248,23 @@ def title_search():
     if not search_string:
         return jsonify({'error': True, 'message': "search-string needed"}), 400
 
-    data = Article.admin_title_search(admin_id, search_string)
-    return jsonify({'error': False, 'data': data}), 200
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    data = Article.admin_title_search(admin_id, search_string, needed_attributes, sort, match)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @article.get("/search/body")
@@ -182,8 +282,23 @@ def body_search():
     if not search_string:
         return jsonify({'error': True, 'message': "search-string needed"}), 400
 
-    data = Article.admin_body_search(admin_id, search_string)
-    return jsonify({'error': False, 'data': data}), 200
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    data = Article.admin_body_search(admin_id, search_string, needed_attributes, sort, match)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @article.get("/pagination/article-search")
@@ -199,12 +314,11 @@ def article_search_pagination():
 
     search_string = request.args.get('search-string', None)
     search_target = request.args.get('search-target', None)
-    acceptable_targets = ['article', 'title', 'body']
 
     if not search_string or not search_target:
         return jsonify({'error': True, 'message': "all values needed"}), 400
 
-    if search_target not in acceptable_targets:
+    if search_target not in SEARCH_TARGETS:
         return jsonify({'error': True, 'message': "unacceptable search target"}), 400
 
     page = request.args.get('page', 1)
@@ -215,18 +329,24 @@ def article_search_pagination():
     except Exception:
         return jsonify({'error': True, 'message': "page and limit must be an integer"}), 400
 
-    paginate = []
-    if search_target == "body":
-        paginate = Pagination(Article.admin_body_search(
-            admin_id, search_string), page, limit).meta_data()
-    elif search_target == "title":
-        paginate = Pagination(Article.admin_title_search(
-            admin_id, search_string), page, limit).meta_data()
-    else:
-        paginate = Pagination(Article.admin_article_search(
-            admin_id, search_string), page, limit).meta_data()
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
 
-    return jsonify({'error': False, 'data': paginate}), 200
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    paginate = Article.paginate_search(search_string, search_target, page, limit, admin_id, needed_attributes, sort, match).meta_data()
+
+    return jsonify({'error': False, 'data': paginate, **partial_flag()}), 200
 
 
 @article.patch("/update/update-body/<id>")
@@ -254,9 +374,10 @@ def update_body(id: str):
             'message': "body length must be greater than 2"
         }), 400
 
-    if Article.admin_update_body(id, admin_id, body):
-        return jsonify({'error': False, 'message': "article body has been updated"}), 200
-    return jsonify({'error': True, 'message': "something went wrong"}), 500
+    outcome = Article.admin_update_body(id, admin_id, body)
+    if outcome is WriteOutcome.NOT_FOUND:
+        return jsonify({'error': True, 'message': "article not found"}), 404
+    return jsonify({'error': False, 'message': "article body has been updated", 'outcome': outcome.value}), 200
 
 
 @article.patch("/update/update-title/<id>")
@@ -284,15 +405,15 @@ def update_title(id: str):
             'message': "title length must be greater than 2"
         }), 400
 
-    if Article.get_article_by_title(title):
+    outcome = Article.admin_update_title(id, admin_id, title)
+    if outcome is WriteOutcome.NOT_FOUND:
+        return jsonify({'error': True, 'message': "article not found"}), 404
+    if outcome is WriteOutcome.CONFLICT:
         return jsonify({
             'error': True,
             'message': "an article with this title already exists"
         }), 400
-
-    if Article.admin_update_title(id, admin_id, title):
-        return jsonify({'error': False, 'message': "article title has been updated"}), 200
-    return jsonify({'error': True, 'message': "something went wrong"}), 500
+    return jsonify({'error': False, 'message': "article title has been updated", 'outcome': outcome.value}), 200
 
 
 @article.patch("/update/update-image-url/<id>")
@@ -314,9 +435,10 @@ def update_image(id: str):
             'message': "image_url required"
         }), 400
 
-    if Article.admin_update_image_url(id, admin_id, image_url):
-        return jsonify({'error': False, 'message': "article image url has been updated"}), 200
-    return jsonify({'error': True, 'message': "something went wrong"}), 500
+    outcome = Article.admin_update_image_url(id, admin_id, image_url)
+    if outcome is WriteOutcome.NOT_FOUND:
+        return jsonify({'error': True, 'message': "article not found"}), 404
+    return jsonify({'error': False, 'message': "article image url has been updated", 'outcome': outcome.value}), 200
 
 
 @article.put("/update/update-article/<id>")
@@ -346,21 +468,21 @@ def update_article(id: str):
             'message': "title length must be greater than 2"
         }), 400
 
-    if Article.get_article_by_title(title):
+    if len(body) < 3:
         return jsonify({
             'error': True,
-            'message': "an article with this title already exists"
+            'message': "body length must be greater than 2"
         }), 400
 
-    if len(body) < 3:
+    outcome = Article.admin_update_article(id, admin_id, title, body, image_url)
+    if outcome is WriteOutcome.NOT_FOUND:
+        return jsonify({'error': True, 'message': "article not found"}), 404
+    if outcome is WriteOutcome.CONFLICT:
         return jsonify({
             'error': True,
-            'message': "body length must be greater than 2"
+            'message': "an article with this title already exists"
         }), 400
-
-    if Article.admin_update_article(id, admin_id, title, body, image_url):
-        return jsonify({'error': False, 'message': "article image url has been updated"}), 200
-    return jsonify({'error': True, 'message': "something went wrong"}), 500
+    return jsonify({'error': False, 'message': "article has been updated", 'outcome': outcome.value}), 200
 
 
 @article.delete("/delete/delete-image-url/<id>")
@@ -374,11 +496,10 @@ def delete_image_url(id:str):
             'message': "access token needed"
         }), 401
     
-    if Article.get_article_by_id(id, admin_id):
-        if Article.admin_delete_image_url(id, admin_id):
-            return jsonify({'error': False, 'message': "image url has been deleted"}), 200
-        return jsonify({'error': True, 'message': "something went wrong"}), 500
-    return jsonify({'error': True, 'message': "article not found"}), 404
+    outcome = Article.admin_delete_image_url(id, admin_id)
+    if outcome is WriteOutcome.NOT_FOUND:
+        return jsonify({'error': True, 'message': "article not found"}), 404
+    return jsonify({'error': False, 'message': "image url has been deleted", 'outcome': outcome.value}), 200
 
 @article.delete("/delete/<id>")
 @jwt_required()
@@ -391,8 +512,236 @@ def delete_article(id:str):
             'message': "access token needed"
         }), 401
     
-    if Article.get_article_by_id(id, admin_id):
-        if Article.admin_delete_article(id, admin_id):
-            return jsonify({'error': False, 'message': "article has been deleted"}), 200
-        return jsonify({'error': True, 'message': "something went wrong"}), 500
-    return jsonify({'error': True, 'message': "article not found"}), 404
+    outcome = Article.admin_delete_article(id, admin_id)
+    if outcome is WriteOutcome.NOT_FOUND:
+        return jsonify({'error': True, 'message': "article not found"}), 404
+    return jsonify({'error': False, 'message': "article has been deleted", 'outcome': outcome.value}), 200
+
+
+def import_records(lines: Iterable, admin_id: str):
+    """Validates NDJSON records like create-article and inserts them in batches.
+
+    Yields a result line for every rejected record and a summary line at the
+    end; at most one batch of records is held in memory.
+    """
+    loads = current_app.json.loads
+    dumps = current_app.json.dumps
+    batch, line_numbers = [], []
+    counts = {'inserted': 0, 'failed': 0}
+
+    def write_batch():
+        failed = Article.insert_articles(batch)
+        for index, write_error in sorted(failed.items()):
+            message = ("an article with this title already exists" if write_error.get('code') == 11000
+                       else write_error.get('errmsg', "something went wrong"))
+            yield dumps({'line': line_numbers[index], 'error': True, 'message': message}) + '\n'
+        counts['inserted'] += len(batch) - len(failed)
+        counts['failed'] += len(failed)
+        batch.clear()
+        line_numbers.clear()
+
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except ValueError:
+            record = None
+        error = article_error(record.get('title'), record.get('body')) if isinstance(record, dict) else "invalid json record"
+        if error:
+            counts['failed'] += 1
+            yield dumps({'line': line_number, 'error': True, 'message': error}) + '\n'
+            continue
+
+        batch.append({
+            'title': record['title'],
+            'body': record['body'],
+            'image_url': record.get('image_url'),
+            'admin_id': admin_id
+        })
+        line_numbers.append(line_number)
+        if len(batch) >= ARTICLE_IMPORT_BATCH_SIZE:
+            yield from write_batch()
+
+    if batch:
+        yield from write_batch()
+    yield dumps({'error': False, 'summary': True, **counts}) + '\n'
+
+
+@article.post("/import")
+@jwt_required()
+def import_articles():
+    admin_id = get_jwt_identity()
+
+    if not valid_object_id(admin_id):
+        return jsonify({
+            'error': True,
+            'message': "access token needed"
+        }), 401
+
+    # The body is read line by line while the results stream back.
+    lines = request.stream
+    if request.content_encoding == 'gzip':
+        import gzip
+        lines = gzip.GzipFile(fileobj=lines)
+
+    return Response(stream_with_context(import_records(lines, admin_id)), mimetype='application/x-ndjson')
+
+
+@article.get("/export")
+@jwt_required()
+def export_articles():
+    admin_id = get_jwt_identity()
+
+    if not valid_object_id(admin_id):
+        return jsonify({
+            'error': True,
+            'message': "access token needed"
+        }), 401
+
+    compress = request.args.get('compress')
+    if compress not in (None, 'gzip'):
+        return jsonify({
+            'error': True,
+            'message': "compress must be gzip"
+        }), 400
+
+    chunks = ndjson_lines(Article.iter_articles({'admin_id': admin_id}, ARTICLE_ATTRIBUTES, True))
+    if compress == 'gzip':
+        return Response(stream_with_context(gzip_chunks(chunks)), mimetype='application/gzip',
+                        headers={'Content-Disposition': 'attachment; filename=articles.ndjson.gz'})
+    return Response(stream_with_context(chunks), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=articles.ndjson'})
+
+
+def bulk_ids_error(ids):
+    """Returns the 400 response for an unusable bulk id list, or None."""
+    if not isinstance(ids, list) or not ids or not all(isinstance(id, str) for id in ids):
+        return jsonify({
+            'error': True,
+            'message': "ids must be a non-empty list of article ids"
+        }), 400
+
+    if len(ids) > BULK_MAX_IDS:
+        return jsonify({
+            'error': True,
+            'message': f"at most {BULK_MAX_IDS} articles can be changed at once"
+        }), 400
+
+    invalid_ids = [id for id in ids if not valid_object_id(id)]
+    if invalid_ids:
+        return jsonify({
+            'error': True,
+            'message': "invalid article ids",
+            'invalid_ids': invalid_ids
+        }), 400
+    return None
+
+
+def canonical_ids(ids: List) -> List:
+    # Outcomes are keyed by the stored id, so requested ids are normalized the
+    # same way (lowercase hex) before deduplicating and looking them up.
+    return list(dict.fromkeys(str(ObjectId(id)) for id in ids))
+
+
+def bulk_outcomes(outcomes: Dict):
+    counts = {}
+    for outcome in outcomes.values():
+        counts[outcome.value] = counts.get(outcome.value, 0) + 1
+    return jsonify({
+        'error': False,
+        'data': [{'_id': id, 'outcome': outcome.value} for id, outcome in outcomes.items()],
+        'counts': counts
+    }), 200
+
+
+@article.post("/bulk/delete")
+@jwt_required()
+def bulk_delete():
+    admin_id = get_jwt_identity()
+
+    if not valid_object_id(admin_id):
+        return jsonify({
+            'error': True,
+            'message': "access token needed"
+        }), 401
+
+    ids = (request.get_json(silent=True) or {}).get('ids')
+    error = bulk_ids_error(ids)
+    if error:
+        return error
+
+    return bulk_outcomes(Article.admin_bulk_delete(canonical_ids(ids), admin_id))
+
+
+@article.post("/bulk/delete-image-url")
+@jwt_required()
+def bulk_delete_image_url():
+    admin_id = get_jwt_identity()
+
+    if not valid_object_id(admin_id):
+        return jsonify({
+            'error': True,
+            'message': "access token needed"
+        }), 401
+
+    ids = (request.get_json(silent=True) or {}).get('ids')
+    error = bulk_ids_error(ids)
+    if error:
+        return error
+
+    return bulk_outcomes(Article.admin_bulk_delete_image_url(canonical_ids(ids), admin_id))
+
+
+@article.patch("/bulk/update")
+@jwt_required()
+def bulk_update():
+    admin_id = get_jwt_identity()
+
+    if not valid_object_id(admin_id):
+        return jsonify({
+            'error': True,
+            'message': "access token needed"
+        }), 401
+
+    updates = (request.get_json(silent=True) or {}).get('updates')
+    if not isinstance(updates, list) or not all(isinstance(update, dict) for update in updates):
+        return jsonify({
+            'error': True,
+            'message': "updates must be a list of objects with an _id and the fields to set"
+        }), 400
+
+    ids = [update.get('_id') for update in updates]
+    error = bulk_ids_error(ids)
+    if error:
+        return error
+
+    ids = [str(ObjectId(id)) for id in ids]
+    if len(set(ids)) != len(ids):
+        return jsonify({
+            'error': True,
+            'message': "each article can only appear once in updates"
+        }), 400
+
+    changes = {}
+    for id, update in zip(ids, updates):
+        values = {key: value for key, value in update.items() if key != '_id'}
+        if not values or not set(values) <= {'title', 'body', 'image_url'}:
+            error = "only title, body and image_url can be updated"
+        elif any(not isinstance(value, str) for value in values.values()):
+            error = "title, body and image_url must be strings"
+        elif 'title' in values and len(values['title']) < 3:
+            error = "title length must be greater than 2"
+        elif 'body' in values and len(values['body']) < 3:
+            error = "body length must be greater than 2"
+        elif 'image_url' in values and not values['image_url']:
+            error = "image_url required"
+        if error:
+            return jsonify({
+                'error': True,
+                'message': error,
+                '_id': update['_id']
+            }), 400
+        changes[id] = values
+
+    return bulk_outcomes(Article.admin_bulk_update(changes, admin_id))
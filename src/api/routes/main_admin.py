@@ -1,24 +1,28 @@
 from flask import Blueprint, jsonify, request
 from typing import Dict
-from werkzeug.security import generate_password_hash, check_password_hash
 from src.config import DEFAULT_MAIN_ADMIN_PASS
+from src.api.models import connection
 from src.api.models.Admin import Admin
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from src.modules.valid_object_id import valid_object_id
+from src.modules.password_hasher import hash_password
+from src.modules.response_cache import article_cache
+from src.modules.identity_cache import admin_cache, current_admin
+from src.modules import time_budget
 
 main_admin = Blueprint("main_admin",__name__,url_prefix="/api/main-admin")
 
 
 @main_admin.get("/create-main-admin")
 def create_main_admin():
-    password_hash = generate_password_hash(DEFAULT_MAIN_ADMIN_PASS)
-
     if Admin.get_admin_by_type("main"):
         return jsonify({
             'error': True,
             'message': "admin type already exists"
         }), 400
 
+    password_hash = hash_password(DEFAULT_MAIN_ADMIN_PASS)
+
     admin: Dict = {
         'name': "ChiChi",
         'password': password_hash,
@@ -42,8 +46,7 @@ def create_main_admin():
 @main_admin.get('/token/admin-token')
 @jwt_required()
 def admin_token():
-    admin_id = get_jwt_identity()
-    admin = Admin.get_admin_by_id(admin_id)
+    admin = current_admin()
 
     if admin:
         if admin['type'] == "main":
@@ -67,8 +70,7 @@ def admin_token():
 @main_admin.delete('/delete/delete-admin')
 @jwt_required()
 def delete_admin():
-    admin_id = get_jwt_identity()
-    admin = Admin.get_admin_by_id(admin_id)
+    admin = current_admin()
 
     if admin:
         if admin['type'] == "main":
@@ -87,3 +89,25 @@ def delete_admin():
         'error': True,
         'message': "admin does not exists"
     }), 404
+
+
+@main_admin.get('/cache/stats')
+@jwt_required()
+def cache_stats():
+    identity = get_jwt_identity()
+
+    if identity == "main":
+        return jsonify({
+            'error': False,
+            'data': {
+                'article_cache': article_cache.stats(),
+                'admin_identity_cache': admin_cache.stats(),
+                'query_budgets': time_budget.stats(),
+                'mongo_pool': connection.stats()
+            }
+        }), 200
+
+    return jsonify({
+        'error': True,
+        'message': "not authorized"
+    }), 401
@@ -0,0 +1,27 @@
+from hmac import compare_digest
+from flask import Blueprint, Response, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from src.config import METRICS_TOKEN
+from src.modules.metrics import CONTENT_TYPE, render
+
+metrics = Blueprint("metrics", __name__)
+
+
+def authorized() -> bool:
+    # Scrapers send METRICS_TOKEN; anyone else needs the main admin's token,
+    # as for /api/main-admin/cache/stats.
+    if METRICS_TOKEN and compare_digest(request.headers.get('Authorization', '').encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        return True
+    verify_jwt_in_request(optional=True)
+    return get_jwt_identity() == "main"
+
+
+@metrics.get("/metrics")
+def prometheus_metrics():
+    if not authorized():
+        return jsonify({
+            'error': True,
+            'message': "not authorized"
+        }), 401
+
+    return Response(render(), mimetype=CONTENT_TYPE)
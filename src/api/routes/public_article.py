@@ -1,13 +1,28 @@
 from flask import Blueprint, jsonify, request
 from typing import Dict, List
-from src.api.models.Article import Article
+from bson.objectid import ObjectId
+from src.api.models.Article import Article, ARTICLE_VIEWS
 from src.modules.valid_object_id import valid_object_id
-from src.modules.Pagination import Pagination
+from src.modules.field_selection import field_selection
+from src.modules.time_budget import partial_flag
+from src.modules.search import SEARCH_MATCHES, SEARCH_SORTS, SEARCH_TARGETS
+from src.modules.streaming import STREAM_FORMATS, stream_documents
+from src.modules.response_cache import cached_documents, cached_response
+from src.modules.conditional import conditional_get, request_stamp
 from flask_jwt_extended import jwt_required
+from src.config import MULTI_GET_MAX_IDS, SUGGEST_MAX_LIMIT
 
 public_article = Blueprint("public_article", __name__, url_prefix="/api/public-article")
 
+
+def collection_stamp(**kwargs):
+    # Shared by cached_response and conditional_get so the stamp is read once.
+    return Article.get_collection_stamp()
+
+
 @public_article.get("/get-article/<id>")
+@cached_response(tag_arg='id', stamp=Article.get_article_stamp)
+@conditional_get(Article.get_article_stamp)
 def get_article(id: str):
 
     data: Dict = Article.get_public_article_by_id(id)
@@ -24,13 +39,91 @@ def get_article(id: str):
     }), 404
 
 
+def multi_get_stamp(**kwargs):
+    # POST bodies aren't part of the ETag, so only GET is validated.
+    return request_stamp(collection_stamp, (), kwargs) if request.method == 'GET' else None
+
+
+@public_article.route("/get-articles", methods=['GET', 'POST'])
+@conditional_get(multi_get_stamp)
+def get_articles():
+    if request.method == 'POST':
+        ids = (request.get_json(silent=True) or {}).get('ids')
+        if not isinstance(ids, list) or not all(isinstance(id, str) for id in ids):
+            return jsonify({
+                'error': True,
+                'message': "ids must be a list of article ids"
+            }), 400
+    else:
+        ids = [id.strip() for id in request.args.get('ids', '').split(',') if id.strip()]
+
+    if not ids:
+        return jsonify({
+            'error': True,
+            'message': "ids required"
+        }), 400
+
+    if len(ids) > MULTI_GET_MAX_IDS:
+        return jsonify({
+            'error': True,
+            'message': f"at most {MULTI_GET_MAX_IDS} ids can be requested at once"
+        }), 400
+
+    invalid_ids = [id for id in ids if not valid_object_id(id)]
+    if invalid_ids:
+        return jsonify({
+            'error': True,
+            'message': "invalid article ids",
+            'invalid_ids': invalid_ids
+        }), 400
+
+    needed_attributes = field_selection(request.args.get('fields'), request.args.get('view'), ARTICLE_VIEWS)
+    if needed_attributes is None:
+        return jsonify({
+            'error': True,
+            'message': "unknown view or field requested"
+        }), 400
+
+    # Documents come back keyed by their canonical lowercase id, so the
+    # requested ids are normalized the same way before lookup and ordering.
+    ids = [str(ObjectId(id)) for id in ids]
+    version, _ = request_stamp(collection_stamp, (), {})
+    found = cached_documents(
+        list(dict.fromkeys(ids)), tuple(needed_attributes), version,
+        lambda missing: Article.get_articles_by_ids(missing, needed_attributes))
+
+    # Results follow the requested order; ids with no article get a null slot.
+    return jsonify({
+        'error': False,
+        'data': [found.get(id) for id in ids],
+        'not_found': [id for id in dict.fromkeys(ids) if id not in found]
+    }), 200
+
+
 @public_article.get("/get-all-articles")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
 def get_all_article():
-    data: List = Article.get_all_articles()
-    return jsonify({'error': False, 'data': data}), 200
+    format = request.args.get('format', 'json')
+
+    if format not in STREAM_FORMATS:
+        return jsonify({'error': True, 'message': "format must be json, ndjson or stream"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    if format != 'json':
+        return stream_documents(Article.iter_articles({}, needed_attributes), format)
+
+    data: List = Article.get_all_articles(needed_attributes)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @public_article.get("/pagination/article-pagination")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
 def article_pagination():
     try:
         page = int(request.args.get('page', 1))
@@ -38,55 +131,152 @@ def article_pagination():
     except Exception:
         return jsonify({'error': True, 'message': "page and limit must be an integer"}), 400
 
-    paginate = Pagination(Article.get_all_articles(), page, limit).meta_data()
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    paginate = Article.paginate_articles(page, limit, needed_attributes).meta_data()
+
+    return jsonify({'error': False, 'data': paginate, **partial_flag()}), 200
 
-    return jsonify({'error': False, 'data': paginate}), 200
+
+@public_article.get("/pagination/article-cursor")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
+def article_cursor_pagination():
+    try:
+        limit = int(request.args.get('limit', 10))
+    except Exception:
+        return jsonify({'error': True, 'message': "limit must be an integer"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    try:
+        paginate = Article.cursor_page({}, request.args.get('cursor', None), limit, needed_attributes)
+    except ValueError:
+        return jsonify({'error': True, 'message': "invalid cursor"}), 400
+
+    return jsonify({'error': False, 'data': paginate, **partial_flag()}), 200
+
+
+@public_article.get("/suggest")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
+def suggest():
+    prefix = request.args.get('prefix', None)
+
+    if not prefix:
+        return jsonify({'error': True, 'message': "prefix needed"}), 400
+
+    try:
+        limit = int(request.args.get('limit', 10))
+    except Exception:
+        return jsonify({'error': True, 'message': "limit must be an integer"}), 400
+
+    data = Article.suggest_titles(prefix, min(max(limit, 1), SUGGEST_MAX_LIMIT))
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @public_article.get("/search")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
 def article_search():
     search_string = request.args.get('search-string', None)
 
     if not search_string:
         return jsonify({'error': True, 'message': "search-string needed"}), 400
 
-    data = Article.article_search(search_string)
-    return jsonify({'error': False, 'data': data}), 200
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    data = Article.article_search(search_string, needed_attributes, sort, match)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @public_article.get("/search/title")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
 def title_search():
     search_string = request.args.get('search-string', None)
 
     if not search_string:
         return jsonify({'error': True, 'message': "search-string needed"}), 400
 
-    data = Article.title_search(search_string)
-    return jsonify({'error': False, 'data': data}), 200
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    data = Article.title_search(search_string, needed_attributes, sort, match)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @public_article.get("/search/body")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
 def body_search():
     search_string = request.args.get('search-string', None)
 
     if not search_string:
         return jsonify({'error': True, 'message': "search-string needed"}), 400
 
-    data = Article.body_search(search_string)
-    return jsonify({'error': False, 'data': data}), 200
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    data = Article.body_search(search_string, needed_attributes, sort, match)
+    return jsonify({'error': False, 'data': data, **partial_flag()}), 200
 
 
 @public_article.get("/pagination/article-search")
+@cached_response(stamp=collection_stamp)
+@conditional_get(collection_stamp)
 def article_search_pagination():
 
     search_string = request.args.get('search-string', None)
     search_target = request.args.get('search-target', None)
-    acceptable_targets = ['article', 'title', 'body']
 
     if not search_string or not search_target:
         return jsonify({'error': True, 'message': "all values needed"}), 400
 
-    if search_target not in acceptable_targets:
+    if search_target not in SEARCH_TARGETS:
         return jsonify({'error': True, 'message': "unacceptable search target"}), 400
 
     page = request.args.get('page', 1)
@@ -97,12 +287,21 @@ def article_search_pagination():
     except Exception:
         return jsonify({'error': True, 'message': "page and limit must be an integer"}), 400
 
-    paginate = []
-    if search_target == "body":
-        paginate = Pagination(Article.body_search(search_string), page, limit).meta_data()
-    elif search_target == "title":
-        paginate = Pagination(Article.title_search(search_string), page, limit).meta_data()
-    else:
-        paginate = Pagination(Article.article_search(search_string), page, limit).meta_data()
+    sort = request.args.get('sort', 'relevance')
+
+    if sort not in SEARCH_SORTS:
+        return jsonify({'error': True, 'message': "sort must be relevance or newest"}), 400
+
+    match = request.args.get('match', 'words')
+
+    if match not in SEARCH_MATCHES:
+        return jsonify({'error': True, 'message': "match must be words, substring or fuzzy"}), 400
+
+    needed_attributes = field_selection(request.args.get('fields', None), request.args.get('view', None), ARTICLE_VIEWS)
+
+    if not needed_attributes:
+        return jsonify({'error': True, 'message': "unknown view or field requested"}), 400
+
+    paginate = Article.paginate_search(search_string, search_target, page, limit, needed_attributes=needed_attributes, sort=sort, match=match).meta_data()
 
-    return jsonify({'error': False, 'data': paginate}), 200
+    return jsonify({'error': False, 'data': paginate, **partial_flag()}), 200
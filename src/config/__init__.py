@@ -5,6 +5,7 @@ from datetime import timedelta
 load_dotenv()
 
 MONGODB_URI = os.environ.get('MONGODB_URI')
+MONGODB_DATABASE = os.environ.get('MONGODB_DATABASE', 'chichi_blog_db')
 SECRET_KEY = os.environ.get('SECRET_KEY')
 JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
 JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
@@ -12,3 +13,55 @@ JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
 JWT_TOKEN_LOCATION = ["headers", "query_string"]
 JWT_QUERY_STRING_NAME = "token"
 DEFAULT_MAIN_ADMIN_PASS = os.environ.get('DEFAULT_MAIN_ADMIN_PASS')
+ENSURE_INDEXES_ON_STARTUP = os.environ.get('ENSURE_INDEXES_ON_STARTUP', 'true').lower() == 'true'
+ARTICLE_CACHE_ENABLED = os.environ.get('ARTICLE_CACHE_ENABLED', 'true').lower() == 'true'
+ARTICLE_CACHE_MAX_ENTRIES = int(os.environ.get('ARTICLE_CACHE_MAX_ENTRIES', 1024))
+ARTICLE_CACHE_MAX_SIZE = int(os.environ.get('ARTICLE_CACHE_MAX_SIZE', 32 * 1024 * 1024))
+ARTICLE_CACHE_TTL = float(os.environ.get('ARTICLE_CACHE_TTL', 60))
+ARTICLE_STREAM_BATCH_SIZE = int(os.environ.get('ARTICLE_STREAM_BATCH_SIZE', 200))
+ARTICLE_IMPORT_BATCH_SIZE = int(os.environ.get('ARTICLE_IMPORT_BATCH_SIZE', 500))
+ADMIN_CACHE_MAX_ENTRIES = int(os.environ.get('ADMIN_CACHE_MAX_ENTRIES', 1024))
+ADMIN_CACHE_TTL = float(os.environ.get('ADMIN_CACHE_TTL', 30))
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR', 'inline')
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get('PASSWORD_HASH_CONCURRENCY', 2))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 2))
+SEARCH_MAX_CANDIDATES = int(os.environ.get('SEARCH_MAX_CANDIDATES', 1000))
+SEARCH_MAX_SCANNED = int(os.environ.get('SEARCH_MAX_SCANNED', 10000))
+FUZZY_SEARCH_THRESHOLD = float(os.environ.get('FUZZY_SEARCH_THRESHOLD', 0.6))
+SUGGEST_MAX_LIMIT = int(os.environ.get('SUGGEST_MAX_LIMIT', 20))
+PAGE_MAX_LIMIT = int(os.environ.get('PAGE_MAX_LIMIT', 100))
+MULTI_GET_MAX_IDS = int(os.environ.get('MULTI_GET_MAX_IDS', 100))
+BULK_MAX_IDS = int(os.environ.get('BULK_MAX_IDS', 500))
+SEARCH_TIME_BUDGET_MS = int(os.environ.get('SEARCH_TIME_BUDGET_MS', 2000))
+LIST_TIME_BUDGET_MS = int(os.environ.get('LIST_TIME_BUDGET_MS', 5000))
+# Per-endpoint overrides, e.g. "public_article.article_search=500,article.title_search=800".
+QUERY_TIME_BUDGETS_MS = {
+    endpoint.strip(): int(ms)
+    for endpoint, ms in (item.split('=') for item in os.environ.get('QUERY_TIME_BUDGETS_MS', '').split(',') if item)
+}
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', 100))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ['MONGO_MAX_IDLE_TIME_MS']) if os.environ.get('MONGO_MAX_IDLE_TIME_MS') else None
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ['MONGO_WAIT_QUEUE_TIMEOUT_MS']) if os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS') else None
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', 20000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', 30000))
+MONGO_WARM_UP = os.environ.get('MONGO_WARM_UP', 'false').lower() == 'true'
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+# Shared directory for gunicorn workers' metric files; unset for a single process.
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+# Bearer token a scraper sends for /metrics; without it only the main admin can read them.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+# Share of command replies re-encoded to estimate reply bytes; 0 turns it off.
+METRICS_REPLY_BYTES_SAMPLE_RATE = float(os.environ.get('METRICS_REPLY_BYTES_SAMPLE_RATE', 0))
+# Commands slower than this are written to the slow query log; 0 turns it off.
+SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 0))
+SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG')
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1))
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL', 60))
+# Adds X-DB-Query-Count to every response; always on when the app runs in debug mode.
+QUERY_COUNT_HEADER = os.environ.get('QUERY_COUNT_HEADER', 'false').lower() == 'true'
+# A query shape repeated this many times in one request is reported as a likely N+1.
+REPEATED_QUERY_THRESHOLD = int(os.environ.get('REPEATED_QUERY_THRESHOLD', 5))
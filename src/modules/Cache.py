@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Dict, Hashable, Iterable
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and total size, with a TTL.
+
+    Entries can carry tags so that a group of keys can be dropped at once, and
+    callers that cannot enumerate their keys can fold `generation` into the key
+    and call bump_generation() to orphan all of them; orphans age out through
+    LRU eviction or the TTL.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_size: int = 0, ttl: float = 60):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.__entries = OrderedDict()
+        self.__tags: Dict = {}
+        self.__lock = Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= monotonic():
+                self.__remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value, tags: Iterable = (), size: int = 0):
+        if self.max_size and size > self.max_size:
+            return
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            tags = tuple(tags)
+            self.__entries[key] = (monotonic() + self.ttl, value, tags, size)
+            self.size += size
+            for tag in tags:
+                self.__tags.setdefault(tag, set()).add(key)
+            while len(self.__entries) > self.max_entries or (self.max_size and self.size > self.max_size):
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+
+    def invalidate_tag(self, tag: Hashable):
+        with self.__lock:
+            for key in self.__tags.pop(tag, ()):
+                if key in self.__entries:
+                    self.__remove(key)
+                    self.invalidations += 1
+
+    def invalidate(self, key: Hashable):
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+                self.invalidations += 1
+
+    def bump_generation(self):
+        with self.__lock:
+            self.generation += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__tags.clear()
+            self.size = 0
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self.__entries),
+            'size': self.size,
+            'generation': self.generation,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations
+        }
+
+    def __remove(self, key: Hashable):
+        _, _, tags, size = self.__entries.pop(key)
+        self.size -= size
+        for tag in tags:
+            keys = self.__tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__tags[tag]
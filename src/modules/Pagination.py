@@ -1,19 +1,34 @@
 from math import ceil
+from src.config import PAGE_MAX_LIMIT
 
 class Pagination:
 
-    def __init__(self, data, page=1, results_per_page=10):
+    def __init__(self, data, page=1, results_per_page=10, data_length=None):
+        # When data_length is given, data is already the requested page
+        # (sliced by the database) and data_length is the total match count.
         self.data = data
-        self.data_length = len(data)
-        self.page = page if page > 0 else 1
-        self.results_per_page = results_per_page if results_per_page > 0 else 10
+        self.pre_paged = data_length is not None
+        self.data_length = data_length if self.pre_paged else len(data)
+        self.page, self.results_per_page = Pagination.normalize(page, results_per_page)
         self.__set_offsets()
 
+    @staticmethod
+    def normalize(page, results_per_page):
+        # Page size is capped so a single request can't ask for the whole collection.
+        return (page if page > 0 else 1, min(results_per_page, PAGE_MAX_LIMIT) if results_per_page > 0 else 10)
+
+    @staticmethod
+    def offsets(page, results_per_page):
+        page, results_per_page = Pagination.normalize(page, results_per_page)
+        return ((page-1) * results_per_page, results_per_page)
+
     def __set_offsets(self):
         self.first_offset = (self.page-1) * self.results_per_page
         self.last_offset = self.first_offset + self.results_per_page
 
     def __page_results(self):
+        if self.pre_paged:
+            return self.data
         pagination = self.data[self.first_offset:self.last_offset]
         return pagination
 
@@ -1,36 +1,71 @@
-from typing import Dict,List
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Per-field converters applied on output; every other field is copied as is.
+CONVERTERS = {
+    '_id': str,
+}
 
 
 class Serializer:
+    """Schema for one attribute set, compiled once and shared.
 
-    needed_attributes:List = []
+    Obtain instances with Serializer.compile(needed_attributes) so every call
+    with the same attribute set reuses the same precomputed field lists.
+    """
 
-    def __init__(self,needed_attributes:List):
-        self.needed_attributes = needed_attributes
+    __slots__ = ('needed_attributes', 'converted_attributes', 'read_values', 'projection_document')
 
-    def serialize(self, data:Dict) -> Dict:
-        result:Dict = {}
-        for attr in self.needed_attributes:
-            if attr == '_id':
-                result[attr] = str(data[attr])
-            else:
-                result[attr] = data[attr]
-        return result
+    def __init__(self, needed_attributes: List):
+        self.needed_attributes: Tuple = tuple(needed_attributes)
+        self.converted_attributes: Tuple = tuple(
+            (attr, CONVERTERS[attr]) for attr in self.needed_attributes if attr in CONVERTERS)
+        self.read_values: Callable = values_getter(self.needed_attributes)
+        projection: Dict = {attr: 1 for attr in self.needed_attributes}
+        if '_id' not in projection:
+            projection['_id'] = 0
+        self.projection_document = projection
+
+    @staticmethod
+    def compile(needed_attributes: Iterable) -> 'Serializer':
+        return _compile(tuple(needed_attributes))
 
-    def dump(self,data_list):
-        result:List = []
-        for index in range(len(data_list)):
-            data = self.serialize(data_list[index])
-            result.append(data)
+    def projection(self) -> Dict:
+        # Mongo projection so that only the needed fields leave the server.
+        return dict(self.projection_document)
+
+    def serialize(self, data: Dict) -> Dict:
+        try:
+            values = self.read_values(data)
+        except KeyError:
+            # Documents written before a field existed; missing fields are None.
+            values = tuple(map(data.get, self.needed_attributes))
+        result: Dict = dict(zip(self.needed_attributes, values))
+        for attr, convert in self.converted_attributes:
+            value = result[attr]
+            if value is not None:
+                result[attr] = convert(value)
         return result
-        
-    def dump_find(self,documents) -> List:
-        data = []
-        for document in documents:
-            for attr in self.needed_attributes:
-                if attr == '_id':
-                    document[attr] = str(document[attr])
-                else:
-                    document[attr] = document[attr]
-            data.append(document)
-        return data
\ No newline at end of file
+
+    def dump(self, documents: Iterable) -> List:
+        # Works on lists and cursors alike; documents are never mutated.
+        return list(map(self.serialize, documents))
+
+    def dump_find(self, documents: Iterable) -> List:
+        return self.dump(documents)
+
+
+def values_getter(attributes: Tuple) -> Callable:
+    # itemgetter returns a bare value for a single key; always return a tuple.
+    if len(attributes) == 1:
+        getter = itemgetter(attributes[0])
+        return lambda data: (getter(data),)
+    if not attributes:
+        return lambda data: ()
+    return itemgetter(*attributes)
+
+
+@lru_cache(maxsize=256)
+def _compile(needed_attributes: Tuple) -> Serializer:
+    return Serializer(needed_attributes)
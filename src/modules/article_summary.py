@@ -0,0 +1,22 @@
+from hashlib import sha1
+from math import ceil
+from typing import Dict
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+
+def summarize(body: str) -> Dict:
+    """Derived fields stored alongside an article body at write time."""
+    words = body.split()
+    excerpt = ' '.join(words)
+    if len(excerpt) > EXCERPT_LENGTH:
+        excerpt = excerpt[:EXCERPT_LENGTH].rsplit(' ', 1)[0].rstrip('.,;:') + '...'
+
+    return {
+        'excerpt': excerpt,
+        'word_count': len(words),
+        'reading_time': max(1, ceil(len(words) / WORDS_PER_MINUTE)),
+        # Lets a write tell whether the body changed without reading it back.
+        'body_hash': sha1(body.encode()).hexdigest()
+    }
@@ -0,0 +1,15 @@
+def article_error(title, body) -> str:
+    """Checks the fields required to create an article.
+
+    Returns the error message for the first rule that fails, or None. Used by
+    create-article and by every record of a bulk import.
+    """
+    if not title or not body:
+        return "title and body required"
+    if not isinstance(title, str) or not isinstance(body, str):
+        return "title and body must be strings"
+    if len(title) < 3:
+        return "title length must be greater than 2"
+    if len(body) < 3:
+        return "body length must be greater than 2"
+    return None
@@ -0,0 +1,44 @@
+from random import random
+from bson import encode
+from pymongo.monitoring import CommandListener
+from src.config import METRICS_REPLY_BYTES_SAMPLE_RATE
+from src.modules.metrics import command_bytes, command_documents, command_failures, command_latency
+
+
+class CommandMetrics(CommandListener):
+    """Records duration and documents returned of every Mongo command.
+
+    Reply sizes are only known by encoding the decoded reply again, so they
+    are estimated from a METRICS_REPLY_BYTES_SAMPLE_RATE share of replies.
+    """
+
+    def __init__(self):
+        # Succeeded/failed events don't carry the command, so the collection
+        # is remembered from the started event.
+        self.collections = {}
+
+    def started(self, event):
+        target = event.command.get('collection' if event.command_name == 'getMore' else event.command_name)
+        self.collections[(event.connection_id, event.request_id)] = target if isinstance(target, str) else ''
+
+    def labels(self, event):
+        return (event.command_name, self.collections.pop((event.connection_id, event.request_id), ''))
+
+    def succeeded(self, event):
+        labels = self.labels(event)
+        command_latency.observe(labels, event.duration_micros / 1e6)
+        reply = event.reply
+        cursor = reply.get('cursor')
+        if cursor:
+            documents = len(cursor.get('firstBatch', cursor.get('nextBatch', ())))
+        else:
+            documents = 1 if reply.get('value') else 0
+        if documents:
+            command_documents.inc(labels, documents)
+        if METRICS_REPLY_BYTES_SAMPLE_RATE and random() < METRICS_REPLY_BYTES_SAMPLE_RATE:
+            command_bytes.inc(labels, len(encode(reply)) / METRICS_REPLY_BYTES_SAMPLE_RATE)
+
+    def failed(self, event):
+        labels = self.labels(event)
+        command_latency.observe(labels, event.duration_micros / 1e6)
+        command_failures.inc(labels)
@@ -0,0 +1,57 @@
+from functools import wraps
+from hashlib import sha1
+from flask import Response, current_app, g, request
+from werkzeug.http import is_resource_modified
+from src.modules.time_budget import is_partial
+
+
+def request_stamp(validators, args, kwargs):
+    """validators(*args, **kwargs), evaluated once per request.
+
+    cached_response keys its entries on the same stamp that conditional_get
+    validates with; sharing it saves the second query.
+    """
+    stamps = g.setdefault('validator_stamps', {})
+    if validators not in stamps:
+        stamps[validators] = validators(*args, **kwargs)
+    return stamps[validators]
+
+
+def conditional_get(validators):
+    """Answers If-None-Match/If-Modified-Since with 304 before the view runs.
+
+    validators(*view_args) returns a (version, last_modified) pair from a cheap
+    query, or None to skip validation. The strong ETag combines the version
+    with the endpoint and query args, so every representation gets its own.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            stamp = request_stamp(validators, args, kwargs)
+            if stamp is None:
+                return view(*args, **kwargs)
+
+            version, last_modified = stamp
+            etag = sha1('|'.join([
+                request.endpoint,
+                repr(sorted(kwargs.items())),
+                repr(sorted(request.args.items(multi=True))),
+                str(version)
+            ]).encode()).hexdigest()
+
+            if not is_resource_modified(request.environ, etag, last_modified=last_modified):
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if is_partial():
+                    response.cache_control.no_store = True
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
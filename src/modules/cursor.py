@@ -0,0 +1,22 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Tuple
+from bson.objectid import ObjectId
+
+NEXT = 'n'
+PREV = 'p'
+
+
+def encode_cursor(direction: str, id) -> str:
+    return urlsafe_b64encode(f"{direction}:{id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, ObjectId]:
+    """Returns (direction, ObjectId); raises ValueError for a malformed cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, id = urlsafe_b64decode(padded.encode()).decode().split(':', 1)
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return direction, ObjectId(id)
+    except Exception as error:
+        raise ValueError("invalid cursor") from error
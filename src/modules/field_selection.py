@@ -0,0 +1,22 @@
+from typing import Dict, List
+
+
+def field_selection(fields: str, view: str, views: Dict) -> List:
+    """Turns ?view= and ?fields= values into needed_attributes.
+
+    view picks one of the named attribute sets (default "full"); fields, a
+    comma separated list, picks individual attributes from any of them.
+    Returns None for an unknown view or field.
+    """
+    if not fields:
+        return views.get(view or 'full')
+
+    allowed_attributes = {attr for attributes in views.values() for attr in attributes}
+    needed_attributes = []
+    for field in fields.split(','):
+        field = field.strip()
+        if field not in allowed_attributes:
+            return None
+        if field not in needed_attributes:
+            needed_attributes.append(field)
+    return needed_attributes
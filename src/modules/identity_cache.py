@@ -0,0 +1,25 @@
+from typing import Dict
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+from src.config import ADMIN_CACHE_MAX_ENTRIES, ADMIN_CACHE_TTL
+from src.modules.Cache import LRUCache
+
+# Per-process cache of admin documents keyed by id, used to resolve JWT
+# identities. Every hit is one Admin lookup saved.
+admin_cache = LRUCache(ADMIN_CACHE_MAX_ENTRIES, 0, ADMIN_CACHE_TTL)
+
+
+def invalidate_admin(id):
+    admin_cache.invalidate(str(id))
+
+
+def current_admin() -> Dict:
+    """The admin the request's JWT identity resolves to, {} for "main" or unknown ids.
+
+    Looked up at most once per request, and only by views that read the
+    admin; routes that just need the id use get_jwt_identity().
+    """
+    if 'current_admin' not in g:
+        from src.api.models.Admin import Admin
+        g.current_admin = Admin.get_cached_admin(get_jwt_identity())
+    return g.current_admin
@@ -0,0 +1,183 @@
+import json
+import os
+from glob import glob
+from threading import Lock
+from time import monotonic, time_ns
+from typing import Dict, Iterable, List, Tuple
+from src.config import METRICS_DIR, METRICS_FLUSH_INTERVAL
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name: str, help: str, labels: Tuple):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: Dict = {}
+        self.lock = Lock()
+
+    def inc(self, labels: Tuple, amount: float = 1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def merge(self, values: Dict, other: List):
+        for labels, value in other:
+            labels = tuple(labels)
+            values[labels] = values.get(labels, 0) + value
+
+    def samples(self, labels: Tuple, value) -> Iterable:
+        yield self.name, labels, value
+
+
+class Histogram(Counter):
+    """Fixed-bucket histogram; each label set holds per-bucket counts, sum and count."""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: Tuple, buckets: Tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, labels: Tuple, value: float):
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def merge(self, values: Dict, other: List):
+        for labels, state in other:
+            labels = tuple(labels)
+            current = values.get(labels)
+            values[labels] = state if current is None else [a + b for a, b in zip(current, state)]
+
+    def samples(self, labels: Tuple, state) -> Iterable:
+        cumulative = 0
+        for bound, count in zip(self.buckets, state):
+            cumulative += count
+            yield f"{self.name}_bucket", labels + (('le', repr(float(bound))),), cumulative
+        yield f"{self.name}_bucket", labels + (('le', '+Inf'),), state[-1]
+        yield f"{self.name}_sum", labels, state[-2]
+        yield f"{self.name}_count", labels, state[-1]
+
+
+request_latency = Histogram(
+    'http_request_duration_seconds', "Time spent handling requests, by endpoint.", ('endpoint', 'method', 'status'))
+command_latency = Histogram(
+    'mongodb_command_duration_seconds', "MongoDB command round-trip time.", ('command', 'collection'))
+command_documents = Counter(
+    'mongodb_command_documents_total', "Documents returned by MongoDB commands.", ('command', 'collection'))
+command_bytes = Counter(
+    'mongodb_command_reply_bytes_total', "BSON size of MongoDB command replies, estimated from a sample.", ('command', 'collection'))
+command_failures = Counter(
+    'mongodb_command_failures_total', "MongoDB commands that returned an error.", ('command', 'collection'))
+
+REGISTRY = [request_latency, command_latency, command_documents, command_bytes, command_failures]
+
+last_flush = 0.0
+flush_lock = Lock()
+# Names this process's metrics file. The start time keeps a later process
+# that reuses the pid from overwriting an exited worker's totals.
+process_key = f"{os.getpid()}-{time_ns()}"
+
+
+def snapshot() -> Dict:
+    state = {}
+    for metric in REGISTRY:
+        with metric.lock:
+            state[metric.name] = [[list(labels), list(value) if isinstance(value, list) else value]
+                                  for labels, value in metric.values.items()]
+    return state
+
+
+def flush(force: bool = False):
+    """Writes this process's metrics to METRICS_DIR/<pid>-<start>.json for multiprocess scrapes.
+
+    Files of exited workers are kept so counters never go backwards.
+    """
+    global last_flush
+    if not METRICS_DIR:
+        return
+    now = monotonic()
+    if not force and now - last_flush < METRICS_FLUSH_INTERVAL:
+        return
+    with flush_lock:
+        last_flush = now
+        path = os.path.join(METRICS_DIR, f"{process_key}.json")
+        with open(f"{path}.tmp", 'w') as file:
+            json.dump(snapshot(), file)
+        os.replace(f"{path}.tmp", path)
+
+
+def collect() -> Dict:
+    """Every metric's values, summed across worker files when METRICS_DIR is set."""
+    if METRICS_DIR:
+        flush(force=True)
+        states = []
+        for path in glob(os.path.join(METRICS_DIR, '*.json')):
+            try:
+                with open(path) as file:
+                    states.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+    else:
+        states = [snapshot()]
+
+    merged = {metric.name: {} for metric in REGISTRY}
+    for state in states:
+        for metric in REGISTRY:
+            metric.merge(merged[metric.name], state.get(metric.name, []))
+    return merged
+
+
+def escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render() -> str:
+    """Prometheus text exposition format."""
+    values = collect()
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for label_values, value in sorted(values[metric.name].items()):
+            for name, labels, sample in metric.samples(tuple(zip(metric.labels, label_values)), value):
+                label_text = ','.join(f'{key}="{escape(label)}"' for key, label in labels)
+                lines.append(f"{name}{{{label_text}}} {sample}" if label_text else f"{name} {sample}")
+    return '\n'.join(lines) + '\n'
+
+
+def command_listener():
+    # Handed to the connection and called when its client is created, which
+    # keeps pymongo.monitoring off the import path.
+    from src.modules.command_metrics import CommandMetrics
+    return CommandMetrics()
+
+
+def reset():
+    """Forgets this process's values; a forked worker starts from zero."""
+    global last_flush, process_key
+    for metric in REGISTRY:
+        metric.values = {}
+    last_flush = 0.0
+    process_key = f"{os.getpid()}-{time_ns()}"
+
+
+def clear_directory():
+    """Removes worker files left over from a previous run."""
+    if METRICS_DIR:
+        for path in glob(os.path.join(METRICS_DIR, '*.json')):
+            os.remove(path)
+
+
+os.register_at_fork(after_in_child=reset)
@@ -0,0 +1,137 @@
+import os
+from concurrent.futures import Executor
+from threading import BoundedSemaphore, Lock, local
+from time import monotonic, sleep
+from werkzeug.security import check_password_hash, generate_password_hash
+from src.config import (PASSWORD_HASH_CONCURRENCY, PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_METHOD,
+                        PASSWORD_HASH_QUEUE_TIMEOUT, PASSWORD_SALT_LENGTH)
+
+
+class HashingUnavailable(Exception):
+    """Raised when no hashing slot frees up within PASSWORD_HASH_QUEUE_TIMEOUT."""
+
+
+# Hashing is CPU bound; at most PASSWORD_HASH_CONCURRENCY hashes run at once
+# and later callers wait for a slot, so a login burst cannot take every worker
+# away from article reads. On its own the semaphore only bounds the threads of
+# one process; under gunicorn, gunicorn.conf.py calls share_across_processes()
+# in the master so that every forked worker draws from the same slots.
+hash_slots = BoundedSemaphore(PASSWORD_HASH_CONCURRENCY)
+executor: Executor = None
+executor_lock = Lock()
+current_method: str = None
+
+
+class SlotFiles:
+    """Hashing slots shared between processes, one flock'd file per slot.
+
+    The kernel drops a process's flocks when it dies, so a worker killed while
+    hashing (gunicorn timeout, OOM killer) gives its slot back at once rather
+    than shrinking the pool until the master restarts. Has the acquire/release
+    interface run_bounded uses on a semaphore.
+    """
+
+    POLL_INTERVAL = 0.01
+
+    def __init__(self, directory: str, count: int):
+        self.directory = directory
+        self.paths = [os.path.join(directory, f"slot-{index}") for index in range(count)]
+        self.files = []
+        self.after_fork()
+        os.register_at_fork(after_in_child=self.after_fork)
+
+    def after_fork(self):
+        # Descriptors inherited from the parent share its locks, so every
+        # process opens the slot files itself.
+        for file in self.files:
+            if file is not None:
+                os.close(file)
+        self.files = [None] * len(self.paths)
+        # flock doesn't exclude threads of one process from each other.
+        self.thread_locks = [Lock() for _ in self.paths]
+        self.held = local()
+
+    def try_slot(self, index: int) -> bool:
+        import fcntl
+        if not self.thread_locks[index].acquire(blocking=False):
+            return False
+        try:
+            if self.files[index] is None:
+                self.files[index] = os.open(self.paths[index], os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(self.files[index], fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Held by another process.
+            self.thread_locks[index].release()
+            return False
+        except BaseException:
+            self.thread_locks[index].release()
+            raise
+        self.held.index = index
+        return True
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = monotonic() + timeout
+        while True:
+            if any(self.try_slot(index) for index in range(len(self.paths))):
+                return True
+            if monotonic() >= deadline:
+                return False
+            sleep(self.POLL_INTERVAL)
+
+    def release(self):
+        import fcntl
+        index = self.held.index
+        fcntl.flock(self.files[index], fcntl.LOCK_UN)
+        self.thread_locks[index].release()
+
+    def remove(self):
+        import shutil
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def share_across_processes():
+    """Makes the hashing slots shared by every process forked after this call."""
+    global hash_slots
+    import tempfile
+    hash_slots = SlotFiles(tempfile.mkdtemp(prefix='chichi-hash-slots-'), PASSWORD_HASH_CONCURRENCY)
+
+
+def get_executor() -> Executor:
+    global executor
+    with executor_lock:
+        if executor is None:
+            # Pulls in multiprocessing, so only imported when configured.
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_CONCURRENCY)
+        return executor
+
+
+def run_bounded(function, *args):
+    if not hash_slots.acquire(timeout=PASSWORD_HASH_QUEUE_TIMEOUT):
+        raise HashingUnavailable()
+    try:
+        # Inline by default: the request thread holding the slot does the work
+        # itself. 'process' moves it off the GIL for threaded workers.
+        if PASSWORD_HASH_EXECUTOR == 'process':
+            return get_executor().submit(function, *args).result()
+        return function(*args)
+    finally:
+        hash_slots.release()
+
+
+def hash_password(password: str) -> str:
+    return run_bounded(generate_password_hash, password, PASSWORD_HASH_METHOD, PASSWORD_SALT_LENGTH)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    return run_bounded(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True when a stored hash was made with other parameters than the configured ones."""
+    global current_method
+    if current_method is None:
+        # werkzeug expands defaults into the stored method (e.g. "scrypt:32768:8:1").
+        current_method = generate_password_hash('', PASSWORD_HASH_METHOD, 1).split('$', 1)[0]
+    parts = password_hash.split('$')
+    return len(parts) != 3 or parts[0] != current_method or len(parts[1]) != PASSWORD_SALT_LENGTH
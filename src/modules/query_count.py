@@ -0,0 +1,76 @@
+from collections import Counter
+from contextlib import contextmanager
+from threading import local
+from typing import Dict, List
+from flask import current_app, g, has_request_context
+from src.config import QUERY_COUNT_HEADER, REPEATED_QUERY_THRESHOLD
+from src.modules.slow_query import query_shape, shape_key
+
+# Counters opened with count_queries() on this thread.
+active = local()
+
+
+class QueryCount:
+    def __init__(self):
+        self.count = 0
+        self.commands: List = []
+
+
+def query_count_listener():
+    # Called when the connection creates its client; see metrics.command_listener.
+    from src.modules.query_count_listener import QueryCountListener
+    return QueryCountListener()
+
+
+def tracking() -> bool:
+    return QUERY_COUNT_HEADER or current_app.debug
+
+
+def record(command_name: str, command: Dict):
+    """Counts one round trip against the current request and any open counters."""
+    counters = getattr(active, 'counters', ())
+    for counter in counters:
+        counter.count += 1
+        counter.commands.append((command_name, command.get(command_name)))
+
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+        if tracking():
+            shapes = g.setdefault('db_query_shapes', Counter())
+            shapes[shape_key(command.get(command_name), command_name, query_shape(command))] += 1
+
+
+def request_query_count() -> int:
+    return g.get('db_queries', 0)
+
+
+def repeated_queries() -> Dict:
+    """Query shapes run at least REPEATED_QUERY_THRESHOLD times in this request."""
+    shapes = g.get('db_query_shapes') or {}
+    return {shape: count for shape, count in shapes.items() if count >= REPEATED_QUERY_THRESHOLD}
+
+
+@contextmanager
+def count_queries():
+    """Counts the Mongo round trips made on this thread inside the block."""
+    counter = QueryCount()
+    counters = getattr(active, 'counters', None)
+    if counters is None:
+        counters = active.counters = []
+    counters.append(counter)
+    try:
+        yield counter
+    finally:
+        counters.remove(counter)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fails when the block makes more than `limit` Mongo round trips.
+
+    For tests, e.g. `with assert_max_queries(1): client.delete(...)`.
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        raise AssertionError(f"{counter.count} queries, budget is {limit}: {counter.commands}")
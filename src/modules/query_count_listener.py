@@ -0,0 +1,15 @@
+from pymongo.monitoring import CommandListener
+from src.modules.query_count import record
+
+
+class QueryCountListener(CommandListener):
+    """Counts every command a request (or count_queries block) sends to Mongo."""
+
+    def started(self, event):
+        record(event.command_name, event.command)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
@@ -0,0 +1,96 @@
+from functools import wraps
+from flask import Response, current_app, request
+from src.config import ARTICLE_CACHE_ENABLED, ARTICLE_CACHE_MAX_ENTRIES, ARTICLE_CACHE_MAX_SIZE, ARTICLE_CACHE_TTL
+from src.modules.Cache import LRUCache
+from src.modules.conditional import request_stamp
+from src.modules.time_budget import is_partial
+
+# Per-process cache of public article responses. Writes invalidate the cache
+# of the process that handled them; responses cached with a stamp are also
+# keyed on the stored version, so other workers miss as soon as it changes.
+# Multi-get documents are keyed on the collection version the same way.
+article_cache = LRUCache(ARTICLE_CACHE_MAX_ENTRIES, ARTICLE_CACHE_MAX_SIZE, ARTICLE_CACHE_TTL)
+
+
+def invalidate_article(id=None):
+    """Drops cached reads of one article and every cached list and search."""
+    if id is not None:
+        article_cache.invalidate_tag(str(id))
+    article_cache.bump_generation()
+
+
+def cached_response(cache: LRUCache = article_cache, tag_arg: str = None, stamp=None):
+    """Caches successful responses keyed by endpoint, view args and query args.
+
+    With tag_arg the entry is tagged with that view argument (e.g. an article
+    id) and invalidated by it; otherwise the key includes the cache generation.
+    stamp is the validators function of the view's conditional_get; its
+    version joins the key, so a write made by any worker is seen on the next
+    request at the cost of the stamp query the view makes anyway.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not ARTICLE_CACHE_ENABLED:
+                return view(*args, **kwargs)
+
+            tag = str(kwargs[tag_arg]) if tag_arg else None
+            generation = cache.generation
+            version = request_stamp(stamp, args, kwargs) if stamp else None
+            key = (
+                request.endpoint,
+                tuple(sorted(kwargs.items())),
+                tuple(sorted(request.args.items(multi=True))),
+                None if tag else generation,
+                version[0] if version else None
+            )
+
+            cached = cache.get(key)
+            if cached is not None:
+                body, status, headers = cached
+                # Cached responses carry their ETag/Last-Modified, so a revalidating
+                # client gets a 304 without touching the database.
+                return Response(body, status, headers).make_conditional(request)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            # A write during the read bumps the generation; don't cache what may be stale.
+            # Results cut short by a time budget are never cached either.
+            if (response.status_code == 200 and not response.is_streamed and not is_partial()
+                    and cache.generation == generation):
+                body = response.get_data()
+                cache.set(key, (body, response.status_code, list(response.headers)),
+                          (tag,) if tag else (), len(body))
+            return response
+        return wrapper
+    return decorator
+
+
+def cached_documents(ids, variant, version, load, cache: LRUCache = article_cache):
+    """Read-through cache for multi-gets, one entry per (variant, version, id).
+
+    version is the collection version the response is validated with, so a
+    write made by another worker is never served under its new ETag. Entries
+    are tagged with the article id so invalidate_article(id) drops them along
+    with the single-article responses. load(missing_ids) must return a dict
+    of the documents it found keyed by id.
+    """
+    if not ARTICLE_CACHE_ENABLED:
+        return load(ids)
+
+    found = {}
+    missing = []
+    for id in ids:
+        document = cache.get((variant, version, id))
+        if document is None:
+            missing.append(id)
+        else:
+            found[id] = document
+
+    if missing:
+        generation = cache.generation
+        loaded = load(missing)
+        found.update(loaded)
+        if cache.generation == generation:
+            for id, document in loaded.items():
+                cache.set((variant, version, id), document, (id,), len(repr(document)))
+    return found
@@ -0,0 +1,78 @@
+import re
+import unicodedata
+from math import log
+from typing import Dict, List
+
+WORD = re.compile(r'\w+')
+SEARCH_SORTS = ['relevance', 'newest']
+SEARCH_MATCHES = ['words', 'substring', 'fuzzy']
+SEARCH_TARGETS = ['article', 'title', 'body']
+MAX_QUERY_TERMS = 10
+
+# BM25 parameters and per-field weights (a simplified BM25F).
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {'title': 2.0, 'body': 1.0}
+
+
+def normalize(text: str) -> str:
+    """Casefolds and strips accents so "Café" and "cafe" compare equal."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return WORD.findall(normalize(text))
+
+
+def query_terms(search_string: str) -> List[str]:
+    terms = []
+    for term in tokenize(search_string):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def title_key(text: str) -> str:
+    """Normalized form of a title (or typed prefix) used for prefix suggestions."""
+    return ' '.join(normalize(text).split())
+
+
+def trigrams(text: str) -> List[str]:
+    text = normalize(text)
+    return sorted({text[index:index + 3] for index in range(len(text) - 2)})
+
+
+def field_terms(field: str, text: str) -> Dict:
+    """Fields stored on an article at write time to back the search indexes:
+    the token list of `field` and its length for word search, and its distinct
+    trigrams for substring search (all multikey indexed)."""
+    terms = tokenize(text)
+    return {f'{field}_terms': terms, f'{field}_length': len(terms), f'{field}_trigrams': trigrams(text)}
+
+
+def search_fields(title: str, body: str) -> Dict:
+    return {**field_terms('title', title), **field_terms('body', body), 'title_normalized': title_key(title)}
+
+
+def idf(document_frequency: int, document_count: int) -> float:
+    return log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+
+def bm25(field: str, terms: List[str], idfs: Dict, average_length: float) -> Dict:
+    """Aggregation expression for one field's BM25 score, so every candidate
+    is scored by the server before any limit applies."""
+    length = {'$ifNull': [f'${field}_length', 0]}
+    norm = {'$add': [K1 * (1 - B), {'$multiply': [K1 * B / (average_length or 1), length]}]}
+    scores = []
+    for term in terms:
+        frequency = {'$size': {'$filter': {
+            'input': {'$ifNull': [f'${field}_terms', []]},
+            'cond': {'$eq': ['$$this', term]}
+        }}}
+        scores.append({'$let': {'vars': {'tf': frequency}, 'in': {'$cond': [
+            {'$gt': ['$$tf', 0]},
+            {'$divide': [{'$multiply': [idfs[term] * (K1 + 1), '$$tf']}, {'$add': ['$$tf', norm]}]},
+            0
+        ]}}})
+    return {'$add': scores}
@@ -0,0 +1,108 @@
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List
+from src.config import SLOW_QUERY_LOG
+
+# Commands explain can answer; only these are tracked by the slow query log.
+EXPLAINABLE = ('find', 'aggregate', 'count', 'distinct', 'findAndModify', 'update', 'delete')
+
+# Fields that describe which documents a command touches; values are redacted.
+SHAPE_FIELDS = ('filter', 'query', 'pipeline', 'sort', 'projection', 'updates', 'deletes', 'update')
+
+logger = logging.getLogger('slow_query')
+logger.setLevel(logging.WARNING)
+if SLOW_QUERY_LOG:
+    handler = logging.FileHandler(SLOW_QUERY_LOG)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+
+
+def slow_query_listener():
+    # Called when the connection creates its client; see metrics.command_listener.
+    from src.modules.slow_query_listener import SlowQueryLog
+    return SlowQueryLog()
+
+
+def redact(value):
+    """Keeps keys and operators, replaces every literal with "?"."""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [redact(item) for item in value]
+        # $in lists and term arrays collapse to one element so their length
+        # doesn't make otherwise identical queries look different.
+        return items[:1] if all(item == '?' for item in items) else items
+    return '?'
+
+
+def query_shape(command: Dict) -> Dict:
+    return {field: redact(command[field]) for field in SHAPE_FIELDS if field in command}
+
+
+def shape_key(collection: str, command_name: str, shape: Dict) -> str:
+    return json.dumps([collection, command_name, shape], sort_keys=True, default=str)
+
+
+def plan_summary(explain: Dict) -> str:
+    """Winning plan as a stage chain, e.g. "FETCH > IXSCAN title_terms"."""
+    planner = explain.get('queryPlanner')
+    if planner is None:
+        # Aggregations put the find-layer plan in their first stage.
+        for stage in explain.get('stages', ()):
+            planner = stage.get('$cursor', {}).get('queryPlanner')
+            if planner:
+                break
+    if not planner:
+        return None
+
+    stages = []
+    plan = planner.get('winningPlan', {})
+    plan = plan.get('queryPlan', plan)
+    while plan:
+        stages.append(f"{plan['stage']} {plan['indexName']}" if plan.get('indexName') else plan.get('stage', '?'))
+        plan = plan.get('inputStage') or (plan.get('inputStages') or [None])[0]
+    return ' > '.join(stages)
+
+
+def log_slow_query(entry: Dict):
+    logger.warning(json.dumps(dict(entry, time=datetime.now().isoformat()), default=str))
+
+
+def summarize(lines: Iterable) -> List[Dict]:
+    """Groups slow query log lines by query shape, slowest total first."""
+    groups = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        key = shape_key(entry['collection'], entry['command'], entry['shape'])
+        group = groups.setdefault(key, {
+            'collection': entry['collection'],
+            'command': entry['command'],
+            'shape': entry['shape'],
+            'durations': [],
+            'pool_wait_ms': 0,
+            'routes': set(),
+            'plans': set()
+        })
+        group['durations'].append(entry['duration_ms'])
+        group['pool_wait_ms'] += entry.get('pool_wait_ms') or 0
+        group['routes'].add(entry.get('route') or '-')
+        if entry.get('plan'):
+            group['plans'].add(entry['plan'])
+
+    summary = []
+    for group in groups.values():
+        durations = sorted(group.pop('durations'))
+        summary.append(dict(
+            group,
+            count=len(durations),
+            total_ms=round(sum(durations), 1),
+            p50_ms=durations[len(durations) // 2],
+            max_ms=durations[-1],
+            routes=sorted(group['routes']),
+            plans=sorted(group['plans'])
+        ))
+    return sorted(summary, key=lambda group: group['total_ms'], reverse=True)
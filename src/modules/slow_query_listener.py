@@ -0,0 +1,93 @@
+from queue import Full, Queue
+from random import random
+from threading import Lock, Thread
+from time import monotonic
+from flask import has_request_context, request
+from pymongo.monitoring import CommandListener
+from src.api.models import connection
+from src.api.models.pool_stats import checkout_wait
+from src.config import SLOW_QUERY_EXPLAIN_INTERVAL, SLOW_QUERY_EXPLAIN_SAMPLE_RATE, SLOW_QUERY_MS
+from src.modules.slow_query import EXPLAINABLE, log_slow_query, plan_summary, query_shape, shape_key
+
+# Session and cluster fields the driver adds; explain must not repeat them.
+DRIVER_FIELDS = ('lsid', 'txnNumber', 'autocommit', 'startTransaction', 'readConcern', 'writeConcern')
+
+
+class SlowQueryLog(CommandListener):
+    """Logs explainable commands slower than SLOW_QUERY_MS.
+
+    A sample of slow entries, at most one per query shape every
+    SLOW_QUERY_EXPLAIN_INTERVAL seconds, is explained on a background thread
+    before being logged; the rest are logged straight away without a plan.
+    """
+
+    def __init__(self):
+        self.started_commands = {}
+        self.last_explained = {}
+        self.lock = Lock()
+        self.explain_queue = Queue(maxsize=16)
+        Thread(target=self.explain_worker, name='slow-query-explain', daemon=True).start()
+
+    def started(self, event):
+        if event.command_name not in EXPLAINABLE:
+            return
+        self.started_commands[(event.connection_id, event.request_id)] = (
+            event.command, event.database_name,
+            request.endpoint if has_request_context() else None,
+            getattr(checkout_wait, 'seconds', None))
+
+    def succeeded(self, event):
+        self.finished(event, None)
+
+    def failed(self, event):
+        self.finished(event, event.failure.get('errmsg') if isinstance(event.failure, dict) else str(event.failure))
+
+    def finished(self, event, error):
+        started = self.started_commands.pop((event.connection_id, event.request_id), None)
+        if started is None or event.duration_micros < SLOW_QUERY_MS * 1000:
+            return
+
+        command, database_name, route, pool_wait = started
+        collection = command.get(event.command_name)
+        shape = query_shape(command)
+        entry = {
+            'route': route,
+            'command': event.command_name,
+            'collection': collection,
+            'shape': shape,
+            'duration_ms': round(event.duration_micros / 1000, 1),
+            'pool_wait_ms': round(pool_wait * 1000, 1) if pool_wait is not None else None,
+            'error': error,
+            'plan': None
+        }
+
+        if self.should_explain(shape_key(collection, event.command_name, shape)):
+            try:
+                self.explain_queue.put_nowait((entry, command, database_name))
+                return
+            except Full:
+                pass
+        log_slow_query(entry)
+
+    def should_explain(self, key: str) -> bool:
+        if random() >= SLOW_QUERY_EXPLAIN_SAMPLE_RATE:
+            return False
+        now = monotonic()
+        with self.lock:
+            if now - self.last_explained.get(key, float('-inf')) < SLOW_QUERY_EXPLAIN_INTERVAL:
+                return False
+            self.last_explained[key] = now
+        return True
+
+    def explain_worker(self):
+        while True:
+            entry, command, database_name = self.explain_queue.get()
+            explained = {key: value for key, value in command.items()
+                         if not key.startswith('$') and key not in DRIVER_FIELDS}
+            try:
+                result = connection.client()[database_name].command(
+                    {'explain': explained, 'verbosity': 'queryPlanner'})
+                entry['plan'] = plan_summary(result)
+            except Exception as error:
+                entry['plan'] = f"explain failed: {error}"
+            log_slow_query(entry)
@@ -0,0 +1,39 @@
+import zlib
+from typing import Iterable
+from flask import Response, current_app, stream_with_context
+
+STREAM_FORMATS = ['json', 'ndjson', 'stream']
+
+
+def stream_documents(documents: Iterable, format: str) -> Response:
+    """Streams documents as NDJSON ("ndjson") or as the usual JSON envelope
+    emitted element by element ("stream"), so memory stays flat."""
+    dumps = current_app.json.dumps
+
+    def json_array():
+        yield '{"error": false, "data": ['
+        separator = ''
+        for document in documents:
+            yield separator + dumps(document)
+            separator = ','
+        yield ']}'
+
+    if format == 'ndjson':
+        return Response(stream_with_context(ndjson_lines(documents)), mimetype='application/x-ndjson')
+    return Response(stream_with_context(json_array()), mimetype='application/json')
+
+
+def ndjson_lines(documents: Iterable):
+    dumps = current_app.json.dumps
+    for document in documents:
+        yield dumps(document) + '\n'
+
+
+def gzip_chunks(chunks: Iterable):
+    """Gzips a stream of str chunks on the fly (wbits=31 writes a gzip header)."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,80 @@
+from collections import Counter
+from typing import Dict, List
+from flask import g, has_request_context, request
+from src.config import LIST_TIME_BUDGET_MS, QUERY_TIME_BUDGETS_MS, SEARCH_TIME_BUDGET_MS
+
+DEFAULT_BUDGETS_MS = {'search': SEARCH_TIME_BUDGET_MS, 'list': LIST_TIME_BUDGET_MS}
+
+# How often each endpoint ran out of budget, split by outcome.
+budget_counters = {'partial': Counter(), 'unavailable': Counter()}
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a query that cannot return partial results runs out of time."""
+
+
+def current_endpoint() -> str:
+    return request.endpoint if has_request_context() else None
+
+
+def budget_ms(kind: str) -> int:
+    return QUERY_TIME_BUDGETS_MS.get(current_endpoint(), DEFAULT_BUDGETS_MS[kind])
+
+
+def is_partial() -> bool:
+    return has_request_context() and g.get('partial_results', False)
+
+
+def partial_flag() -> Dict:
+    """Merged into a response body so clients can tell truncated results apart."""
+    return {'partial': True} if is_partial() else {}
+
+
+def mark_partial():
+    """Flags the response as truncated for reasons other than time, e.g. a candidate cap."""
+    if has_request_context():
+        g.partial_results = True
+
+
+def record_timeout(partial: bool):
+    budget_counters['partial' if partial else 'unavailable'][current_endpoint()] += 1
+    if partial:
+        mark_partial()
+
+
+def collect(cursor, kind: str) -> List:
+    """Reads a find cursor under maxTimeMS, keeping what arrived before the budget ran out."""
+    from pymongo.errors import ExecutionTimeout
+    results = []
+    try:
+        for document in cursor.max_time_ms(budget_ms(kind)):
+            results.append(document)
+    except ExecutionTimeout:
+        record_timeout(True)
+    return results
+
+
+def aggregate(collection, pipeline: List, kind: str, partial: bool = True) -> List:
+    from pymongo.errors import ExecutionTimeout
+    results = []
+    try:
+        for document in collection.aggregate(pipeline, maxTimeMS=budget_ms(kind)):
+            results.append(document)
+    except ExecutionTimeout:
+        record_timeout(partial)
+        if not partial:
+            raise QueryBudgetExceeded()
+    return results
+
+
+def count(collection, query: Dict, kind: str) -> int:
+    from pymongo.errors import ExecutionTimeout
+    try:
+        return collection.count_documents(query, maxTimeMS=budget_ms(kind))
+    except ExecutionTimeout:
+        record_timeout(False)
+        raise QueryBudgetExceeded()
+
+
+def stats() -> Dict:
+    return {outcome: dict(counter) for outcome, counter in budget_counters.items()}
@@ -0,0 +1,5 @@
+def valid_email(email: str) -> bool:
+    # validators is only needed by the admin email routes; importing it here
+    # keeps it off the startup path.
+    import validators
+    return bool(validators.email(email))
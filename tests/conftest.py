@@ -0,0 +1,113 @@
+"""Fixtures for the route tests.
+
+The route tests count real driver round trips through the query count
+listener, so they need a MongoDB server: MONGODB_URI (default
+mongodb://localhost:27017) and MONGODB_DATABASE (default chichi_blog_test),
+which is dropped at the start of the run. Without a reachable server they are
+skipped; the module tests (cache, serializer, cursor, search, slow query log)
+need no database.
+"""
+import os
+from base64 import b64encode
+from uuid import uuid4
+import pytest
+
+os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:27017')
+os.environ.setdefault('MONGODB_DATABASE', 'chichi_blog_test')
+os.environ.setdefault('MONGO_SERVER_SELECTION_TIMEOUT_MS', '2000')
+os.environ.setdefault('SECRET_KEY', 'test-secret')
+os.environ.setdefault('JWT_SECRET_KEY', 'test-jwt-secret-with-at-least-32-bytes')
+os.environ.setdefault('DEFAULT_MAIN_ADMIN_PASS', 'main-admin-password')
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from src.config import DEFAULT_MAIN_ADMIN_PASS, MONGODB_DATABASE, MONGODB_URI  # noqa: E402
+
+MAIN_ADMIN_EMAIL = "chichi@email.com"
+
+
+def basic_auth(email: str, password: str) -> dict:
+    return {'Authorization': 'Basic ' + b64encode(f"{email}:{password}".encode()).decode()}
+
+
+def bearer(token: str) -> dict:
+    return {'Authorization': f"Bearer {token}"}
+
+
+@pytest.fixture(scope='session')
+def app():
+    if MONGODB_DATABASE == 'chichi_blog_db':
+        pytest.exit("Refusing to run tests against chichi_blog_db; set MONGODB_DATABASE to a scratch database.")
+    from src import create_app
+    from src.api.models import connection
+    from src.api.models.indexes import ensure_indexes
+    app = create_app()
+    app.config['TESTING'] = True
+    try:
+        connection.client().admin.command('ping')
+    except Exception as error:
+        pytest.skip(f"MongoDB is not reachable at {MONGODB_URI}: {error}")
+    connection.client().drop_database(connection.database_name)
+    ensure_indexes()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    """Budgets are pinned for the worst case, nothing cached in this process.
+
+    Caches are cleared before every test; tests that make setup requests call
+    the returned function again before the request they measure.
+    """
+    from src.modules.identity_cache import admin_cache
+    from src.modules.response_cache import article_cache
+
+    def clear():
+        admin_cache.clear()
+        article_cache.clear()
+    clear()
+    return clear
+
+
+@pytest.fixture(scope='session')
+def main_admin(app):
+    """Login headers and tokens of the main admin, created once per run."""
+    client = app.test_client()
+    client.get('/api/main-admin/create-main-admin')
+    response = client.get('/api/admin/login', headers=basic_auth(MAIN_ADMIN_EMAIL, DEFAULT_MAIN_ADMIN_PASS))
+    assert response.status_code == 200, response.json
+    tokens = response.json['token']
+    main_token = client.get('/api/main-admin/token/admin-token', headers=bearer(tokens['access_token'])).json['admin_token']
+    return {
+        'id': response.json['data']['_id'],
+        'headers': bearer(tokens['access_token']),
+        'refresh_headers': bearer(tokens['refresh_token']),
+        'main_headers': bearer(main_token)
+    }
+
+
+@pytest.fixture
+def headers(main_admin):
+    return main_admin['headers']
+
+
+def new_title() -> str:
+    return f"Article {uuid4().hex}"
+
+
+@pytest.fixture
+def article(main_admin):
+    """Id of a fresh article owned by the main admin."""
+    from src.api.models.Article import Article
+    title = new_title()
+    Article.create_article({
+        'title': title,
+        'body': "budget test body with a few searchable words",
+        'image_url': "https://example.com/image.png",
+        'admin_id': main_admin['id']
+    })
+    return Article.get_article_by_title(title, ['_id'])['_id']
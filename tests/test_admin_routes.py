@@ -0,0 +1,87 @@
+"""Round-trip budgets for the admin routes.
+
+Views that read the token's admin look it up once per request, one query
+with the identity cache cold. The tests that change credentials run against a
+fresh sub admin so the main admin's login stays valid for the session.
+"""
+from uuid import uuid4
+import pytest
+from src.modules.query_count import assert_max_queries
+from .conftest import DEFAULT_MAIN_ADMIN_PASS, MAIN_ADMIN_EMAIL, basic_auth, bearer
+
+IDENTITY = 1
+PASSWORD = "sub-admin-password"
+
+
+@pytest.fixture
+def sub_admin(client, main_admin, cold_caches):
+    """Email and login tokens of a new sub admin."""
+    email = f"{uuid4().hex}@email.com"
+    client.post('/api/admin/create-admin', json={'name': "Sub", 'password': PASSWORD, 'email': email}, headers=main_admin['main_headers'])
+    tokens = client.get('/api/admin/login', headers=basic_auth(email, PASSWORD)).json['token']
+    cold_caches()
+    return {
+        'email': email,
+        'headers': bearer(tokens['access_token']),
+        'refresh_headers': bearer(tokens['refresh_token'])
+    }
+
+
+def test_login(client, main_admin):
+    # The admin is read by email with its password hash, nothing else.
+    with assert_max_queries(1):
+        response = client.get('/api/admin/login', headers=basic_auth(MAIN_ADMIN_EMAIL, DEFAULT_MAIN_ADMIN_PASS))
+    assert response.status_code == 200
+
+
+def test_login_unknown_email(client, main_admin):
+    with assert_max_queries(1):
+        response = client.get('/api/admin/login', headers=basic_auth("nobody@email.com", "password"))
+    assert response.status_code == 404
+
+
+def test_create_admin(client, main_admin):
+    # The "main" identity needs no lookup; the unique email index makes the
+    # insert the only round trip.
+    with assert_max_queries(1):
+        response = client.post('/api/admin/create-admin', json={
+            'name': "Sub", 'password': PASSWORD, 'email': f"{uuid4().hex}@email.com"
+        }, headers=main_admin['main_headers'])
+    assert response.status_code == 201
+
+
+def test_update_password(client, sub_admin):
+    # The stored hash is read on its own, never from the identity cache.
+    with assert_max_queries(IDENTITY + 2):
+        response = client.patch('/api/admin/update/password', json={'password': PASSWORD, 'new_password': "changed-password"}, headers=sub_admin['headers'])
+    assert response.status_code == 200
+
+
+def test_update_email(client, sub_admin):
+    with assert_max_queries(IDENTITY + 1):
+        response = client.patch('/api/admin/update/email', json={'new_email': f"{uuid4().hex}@email.com"}, headers=sub_admin['headers'])
+    assert response.status_code == 200
+
+
+def test_update_name(client, sub_admin):
+    with assert_max_queries(IDENTITY + 1):
+        response = client.patch('/api/admin/update/name', json={'new_name': "Renamed"}, headers=sub_admin['headers'])
+    assert response.status_code == 200
+
+
+def test_refresh_access_token(client, sub_admin):
+    with assert_max_queries(IDENTITY):
+        response = client.get('/api/admin/token/access-token', headers=sub_admin['refresh_headers'])
+    assert response.status_code == 201
+
+
+def test_test_route(client, sub_admin):
+    # Only reads the identity from the token.
+    with assert_max_queries(0):
+        response = client.get('/api/admin/test', headers=sub_admin['headers'])
+    assert response.status_code == 200
+
+
+def test_update_email_to_the_current_one(client, sub_admin):
+    response = client.patch('/api/admin/update/email', json={'new_email': sub_admin['email']}, headers=sub_admin['headers'])
+    assert response.status_code == 200
@@ -0,0 +1,192 @@
+"""Round-trip budgets for the authenticated article routes.
+
+The JWT identity is the admin id itself, so no admin is looked up.
+Single-article writes cost one findAndModify on the article plus one update of
+the collection's version and search statistics. These routes are not response
+cached, so reads pay for their queries each time.
+"""
+import gzip
+import json
+import pytest
+from src.modules.query_count import assert_max_queries
+from .conftest import new_title
+
+# The article write, then Article.articles_changed.
+WRITE = 2
+# The collection's search statistics, document frequencies of the terms,
+# the ranking aggregation, then the ranked page of articles.
+WORD_SEARCH = 4
+# The ownership read, one bulk_write, then Article.articles_changed.
+BULK = 3
+
+
+def test_update_body(client, headers, article):
+    with assert_max_queries(WRITE):
+        response = client.patch(f'/api/article/update/update-body/{article}', json={'body': "a new body"}, headers=headers)
+    assert response.json['outcome'] == 'modified'
+
+
+def test_update_body_unchanged_skips_the_stamp(client, headers, article, cold_caches):
+    client.patch(f'/api/article/update/update-body/{article}', json={'body': "a new body"}, headers=headers)
+    cold_caches()
+    with assert_max_queries(1):
+        response = client.patch(f'/api/article/update/update-body/{article}', json={'body': "a new body"}, headers=headers)
+    assert response.json['outcome'] == 'unchanged'
+
+
+def test_update_title(client, headers, article):
+    with assert_max_queries(WRITE):
+        response = client.patch(f'/api/article/update/update-title/{article}', json={'title': f"Renamed {article}"}, headers=headers)
+    assert response.json['outcome'] == 'modified'
+
+
+def test_update_image_url(client, headers, article):
+    with assert_max_queries(WRITE):
+        response = client.patch(f'/api/article/update/update-image-url/{article}', json={'image_url': "https://example.com/new.png"}, headers=headers)
+    assert response.json['outcome'] == 'modified'
+
+
+def test_update_article(client, headers, article):
+    with assert_max_queries(WRITE):
+        response = client.put(f'/api/article/update/update-article/{article}', json={
+            'title': f"Replaced {article}", 'body': "a replaced body", 'image_url': "https://example.com/replaced.png"
+        }, headers=headers)
+    assert response.json['outcome'] == 'modified'
+
+
+def test_delete_image_url(client, headers, article):
+    with assert_max_queries(WRITE):
+        response = client.delete(f'/api/article/delete/delete-image-url/{article}', headers=headers)
+    assert response.json['outcome'] == 'modified'
+
+
+def test_delete_article(client, headers, article):
+    with assert_max_queries(WRITE):
+        response = client.delete(f'/api/article/delete/{article}', headers=headers)
+    assert response.json['outcome'] == 'deleted'
+
+
+def test_delete_missing_article(client, headers, article, cold_caches):
+    client.delete(f'/api/article/delete/{article}', headers=headers)
+    cold_caches()
+    with assert_max_queries(1):
+        response = client.delete(f'/api/article/delete/{article}', headers=headers)
+    assert response.status_code == 404
+
+
+def test_create_article(client, headers):
+    with assert_max_queries(WRITE):
+        response = client.post('/api/article/create-article', json={
+            'title': new_title(), 'body': "a created body", 'image_url': "https://example.com/image.png"
+        }, headers=headers)
+    assert response.status_code == 201
+
+
+def test_get_article(client, headers, article):
+    with assert_max_queries(1):
+        response = client.get(f'/api/article/get-article/{article}', headers=headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('format', ['json', 'ndjson'])
+def test_get_all_articles(client, headers, article, format):
+    with assert_max_queries(1):
+        response = client.get(f'/api/article/get-all-articles?view=summary&format={format}', headers=headers)
+        response.get_data()
+    assert response.status_code == 200
+
+
+def test_article_pagination(client, headers, article):
+    # The page and the total count.
+    with assert_max_queries(2):
+        response = client.get('/api/article/pagination/article-pagination?page=1&limit=5&view=summary', headers=headers)
+    assert response.status_code == 200
+
+
+def test_article_cursor(client, headers, article):
+    with assert_max_queries(1):
+        response = client.get('/api/article/pagination/article-cursor?limit=5&view=summary', headers=headers)
+    assert response.status_code == 200
+
+
+def test_suggest(client, headers, article):
+    with assert_max_queries(1):
+        response = client.get('/api/article/suggest?prefix=art', headers=headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('path', ['/search', '/search/title', '/search/body'])
+def test_word_search(client, headers, article, path):
+    with assert_max_queries(WORD_SEARCH):
+        response = client.get(f'/api/article{path}?search-string=searchable+words', headers=headers)
+    assert response.status_code == 200
+
+
+def test_search_pagination(client, headers, article):
+    with assert_max_queries(WORD_SEARCH):
+        response = client.get('/api/article/pagination/article-search?search-string=searchable&search-target=article&page=1&limit=5', headers=headers)
+    assert response.status_code == 200
+
+
+def test_import(client, headers):
+    # One insert_many and one articles_changed per ARTICLE_IMPORT_BATCH_SIZE records.
+    lines = ''.join(json.dumps({'title': new_title(), 'body': "an imported body"}) + '\n' for _ in range(3))
+    with assert_max_queries(WRITE):
+        response = client.post('/api/article/import', data=gzip.compress(lines.encode()),
+                               headers={**headers, 'Content-Encoding': 'gzip'})
+        summary = json.loads(response.get_data(as_text=True).splitlines()[-1])
+    assert summary['inserted'] == 3
+
+
+def test_export(client, headers, article):
+    with assert_max_queries(1):
+        response = client.get('/api/article/export?compress=gzip', headers=headers)
+        response.get_data()
+    assert response.status_code == 200
+
+
+def test_bulk_delete(client, headers, article):
+    with assert_max_queries(BULK):
+        response = client.post('/api/article/bulk/delete', json={'ids': [article]}, headers=headers)
+    assert response.json['counts'] == {'deleted': 1}
+
+
+def test_bulk_delete_image_url(client, headers, article):
+    with assert_max_queries(BULK):
+        response = client.post('/api/article/bulk/delete-image-url', json={'ids': [article]}, headers=headers)
+    assert response.json['counts'] == {'modified': 1}
+
+
+def test_bulk_update(client, headers, article):
+    with assert_max_queries(BULK):
+        response = client.patch('/api/article/bulk/update', json={'updates': [{'_id': article, 'body': "a bulk body"}]}, headers=headers)
+    assert response.json['counts'] == {'modified': 1}
+
+
+def test_bulk_update_unchanged_skips_the_write(client, headers, article, cold_caches):
+    client.patch('/api/article/bulk/update', json={'updates': [{'_id': article, 'body': "a bulk body"}]}, headers=headers)
+    cold_caches()
+    with assert_max_queries(1):
+        response = client.patch('/api/article/bulk/update', json={'updates': [{'_id': article, 'body': "a bulk body"}]}, headers=headers)
+    assert response.json['counts'] == {'unchanged': 1}
+
+
+def test_bulk_delete_outcomes(client, headers, article):
+    # Ids match whatever case they are sent in and come back canonical.
+    missing = "0" * 24
+    response = client.post('/api/article/bulk/delete', json={'ids': [article.upper(), missing]}, headers=headers)
+    assert response.json['data'] == [{'_id': article, 'outcome': 'deleted'}, {'_id': missing, 'outcome': 'not_found'}]
+    assert client.get(f'/api/article/get-article/{article}', headers=headers).status_code == 404
+
+
+def test_bulk_update_outcomes(client, headers, article):
+    response = client.patch('/api/article/bulk/update', json={'updates': [{'_id': article.upper(), 'body': "an uppercase id body"}]}, headers=headers)
+    assert response.json['data'] == [{'_id': article, 'outcome': 'modified'}]
+    assert client.get(f'/api/article/get-article/{article}', headers=headers).json['data']['body'] == "an uppercase id body"
+
+
+def test_bulk_update_rejects_the_same_article_twice(client, headers, article):
+    response = client.patch('/api/article/bulk/update', json={'updates': [
+        {'_id': article, 'body': "first body"}, {'_id': article.upper(), 'body': "second body"}
+    ]}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,105 @@
+"""LRUCache: count and size bounds, TTL expiry, tags and generations."""
+import pytest
+from src.modules import Cache
+from src.modules.Cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the cache's monotonic clock with one the test moves by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(Cache, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_evicts_beyond_max_size():
+    cache = LRUCache(max_entries=10, max_size=10)
+    cache.set('a', 'a', size=6)
+    cache.set('b', 'b', size=6)
+    assert cache.get('a') is None
+    assert cache.get('b') == 'b'
+    assert cache.size == 6
+
+
+def test_skips_a_value_larger_than_max_size():
+    cache = LRUCache(max_entries=10, max_size=10)
+    cache.set('a', 'a', size=6)
+    cache.set('big', 'big', size=11)
+    assert cache.get('big') is None
+    assert cache.get('a') == 'a'
+
+
+def test_replacing_a_key_keeps_the_size_right():
+    cache = LRUCache(max_size=100)
+    cache.set('a', 'a', size=30)
+    cache.set('a', 'b', size=10)
+    assert cache.size == 10
+    assert cache.get('a') == 'b'
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = LRUCache(ttl=60)
+    cache.set('a', 1, size=5)
+    clock[0] += 59
+    assert cache.get('a') == 1
+    clock[0] += 1
+    assert cache.get('a') is None
+    assert cache.size == 0
+    assert cache.stats()['expirations'] == 1
+
+
+def test_invalidate_tag_drops_every_tagged_key():
+    cache = LRUCache()
+    cache.set('article', 1, tags=['42'])
+    cache.set('list', 2, tags=['42', '43'])
+    cache.set('other', 3, tags=['43'])
+    cache.invalidate_tag('42')
+    assert (cache.get('article'), cache.get('list'), cache.get('other')) == (None, None, 3)
+    assert cache.stats()['invalidations'] == 2
+
+
+def test_tags_are_forgotten_with_their_keys():
+    cache = LRUCache(max_entries=1)
+    cache.set('a', 1, tags=['42'])
+    cache.set('b', 2)
+    cache.set('a', 3)
+    cache.invalidate_tag('42')
+    assert cache.get('a') == 3
+
+
+def test_bump_generation_orphans_keys_that_fold_it_in():
+    cache = LRUCache()
+    cache.set(('list', cache.generation), 1)
+    cache.bump_generation()
+    assert cache.get(('list', cache.generation)) is None
+    assert cache.stats()['generation'] == 1
+
+
+def test_invalidate_and_clear():
+    cache = LRUCache()
+    cache.set('a', 1, size=3)
+    cache.set('b', 2, size=4)
+    cache.invalidate('a')
+    assert cache.get('a') is None
+    cache.clear()
+    assert cache.get('b') is None
+    assert cache.stats()['entries'] == cache.size == 0
+
+
+def test_counts_hits_and_misses():
+    cache = LRUCache()
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
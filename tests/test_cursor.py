@@ -0,0 +1,24 @@
+"""Keyset pagination cursors."""
+import pytest
+from bson.objectid import ObjectId
+from src.modules.cursor import NEXT, PREV, decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize('direction', [NEXT, PREV])
+def test_round_trip(direction):
+    id = ObjectId()
+    cursor = encode_cursor(direction, id)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (direction, id)
+
+
+@pytest.mark.parametrize('cursor', [
+    '',
+    'not base64!',
+    encode_cursor('x', ObjectId()),
+    encode_cursor(NEXT, 'not-an-object-id'),
+    encode_cursor(NEXT, ObjectId())[:-2],
+])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,34 @@
+"""Round-trip budgets for the main admin routes.
+
+The "main" token resolves without a lookup; views that read the admin behind
+an access token cost one with the identity cache cold.
+"""
+from src.modules.query_count import assert_max_queries
+
+IDENTITY = 1
+
+
+def test_create_main_admin_when_it_exists(client, main_admin):
+    # The session already created it, so only the existence check runs.
+    with assert_max_queries(1):
+        response = client.get('/api/main-admin/create-main-admin')
+    assert response.status_code == 400
+
+
+def test_admin_token(client, headers):
+    with assert_max_queries(IDENTITY):
+        response = client.get('/api/main-admin/token/admin-token', headers=headers)
+    assert response.status_code == 201
+
+
+def test_delete_admin(client, headers):
+    with assert_max_queries(IDENTITY):
+        response = client.delete('/api/main-admin/delete/delete-admin', headers=headers)
+    assert response.status_code == 200
+
+
+def test_cache_stats(client, main_admin):
+    # Reported from process memory, including the pool's counters.
+    with assert_max_queries(0):
+        response = client.get('/api/main-admin/cache/stats', headers=main_admin['main_headers'])
+    assert response.status_code == 200
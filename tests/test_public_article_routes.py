@@ -0,0 +1,120 @@
+"""Round-trip budgets for the public article routes.
+
+Every cached route reads its stamp first (the article's timestamps, or the
+collection's version document) and shares it with the conditional GET. With
+the response cache cold the view's own reads follow; warm, the stamp is all.
+"""
+import pytest
+from src.modules.query_count import assert_max_queries
+
+STAMP = 1
+# The collection's search statistics, document frequencies of the terms,
+# the ranking aggregation, then the ranked page of articles.
+WORD_SEARCH = 4
+
+
+def test_get_article(client, article):
+    with assert_max_queries(STAMP + 1):
+        response = client.get(f'/api/public-article/get-article/{article}')
+    assert response.status_code == 200
+
+
+def test_get_article_cached(client, article):
+    client.get(f'/api/public-article/get-article/{article}')
+    with assert_max_queries(STAMP):
+        response = client.get(f'/api/public-article/get-article/{article}')
+    assert response.status_code == 200
+
+
+def test_get_article_not_modified(client, article):
+    etag = client.get(f'/api/public-article/get-article/{article}').headers['ETag']
+    with assert_max_queries(STAMP):
+        response = client.get(f'/api/public-article/get-article/{article}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+def test_get_articles(client, article):
+    with assert_max_queries(STAMP + 1):
+        response = client.get(f'/api/public-article/get-articles?ids={article}')
+    assert response.json['data'][0]['_id'] == article
+
+
+def test_post_get_articles(client, article):
+    # No conditional GET for POST, but cached documents are still keyed on the stamp.
+    with assert_max_queries(STAMP + 1):
+        response = client.post('/api/public-article/get-articles', json={'ids': [article]})
+    assert response.json['data'][0]['_id'] == article
+
+
+def test_get_articles_sees_another_workers_write(client, article):
+    # A write made elsewhere bumps the stored version but leaves this
+    # process's cache alone; the cached document must not outlive it.
+    from datetime import datetime
+    from bson.objectid import ObjectId
+    from src.api.models.Article import articles, collection_versions
+    first = client.get(f'/api/public-article/get-articles?ids={article}&fields=title')
+    articles.update_one({'_id': ObjectId(article)}, {'$set': {'title': "Changed elsewhere"}})
+    collection_versions.update_one({'_id': 'articles'}, {'$inc': {'version': 1}, '$set': {'modified_at': datetime.now()}})
+    response = client.get(f'/api/public-article/get-articles?ids={article}&fields=title', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.json['data'][0]['title'] == "Changed elsewhere"
+
+
+def test_get_all_articles(client, article):
+    with assert_max_queries(STAMP + 1):
+        response = client.get('/api/public-article/get-all-articles?view=summary')
+    assert response.status_code == 200
+
+
+def test_get_all_articles_streamed(client, article):
+    with assert_max_queries(STAMP + 1):
+        response = client.get('/api/public-article/get-all-articles?format=ndjson&view=summary')
+        response.get_data()
+    assert response.status_code == 200
+
+
+def test_article_pagination(client, article):
+    # The page and the total count.
+    with assert_max_queries(STAMP + 2):
+        response = client.get('/api/public-article/pagination/article-pagination?page=1&limit=5&view=summary')
+    assert response.status_code == 200
+
+
+def test_article_cursor(client, article):
+    with assert_max_queries(STAMP + 1):
+        response = client.get('/api/public-article/pagination/article-cursor?limit=5&view=summary')
+    assert response.status_code == 200
+
+
+def test_suggest(client, article):
+    with assert_max_queries(STAMP + 1):
+        response = client.get('/api/public-article/suggest?prefix=art')
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('path', ['/search', '/search/title', '/search/body'])
+def test_word_search(client, article, path):
+    with assert_max_queries(STAMP + WORD_SEARCH):
+        response = client.get(f'/api/public-article{path}?search-string=searchable+words')
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('match', ['substring', 'fuzzy'])
+def test_substring_and_fuzzy_search(client, article, match):
+    # Candidate ids, then the articles.
+    with assert_max_queries(STAMP + 2):
+        response = client.get(f'/api/public-article/search?search-string=searchable&match={match}')
+    assert response.status_code == 200
+
+
+def test_newest_search(client, article):
+    # Sorted by id, so no ranking: one find.
+    with assert_max_queries(STAMP + 1):
+        response = client.get('/api/public-article/search?search-string=searchable+words&sort=newest')
+    assert response.status_code == 200
+
+
+def test_search_pagination(client, article):
+    with assert_max_queries(STAMP + WORD_SEARCH):
+        response = client.get('/api/public-article/pagination/article-search?search-string=searchable&search-target=article&page=1&limit=5')
+    assert response.status_code == 200
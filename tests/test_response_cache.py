@@ -0,0 +1,161 @@
+"""cached_response, cached_documents and conditional_get on a bare Flask app."""
+from datetime import datetime
+import pytest
+from flask import Flask, jsonify
+from src.modules.Cache import LRUCache
+from src.modules.conditional import conditional_get
+from src.modules.response_cache import cached_documents, cached_response
+from src.modules.time_budget import mark_partial
+
+MODIFIED = datetime(2026, 1, 1)
+
+
+class View:
+    """A cached, validated view whose stamp and body the test controls."""
+
+    def __init__(self):
+        self.cache = LRUCache()
+        self.version = 1
+        self.calls = 0
+        self.partial = False
+        self.status = 200
+        app = Flask(__name__)
+
+        def stamp(**kwargs):
+            return (self.version, MODIFIED)
+
+        @app.get('/items/<id>')
+        @cached_response(self.cache, tag_arg='id', stamp=stamp)
+        @conditional_get(stamp)
+        def item(id):
+            return self.respond(id)
+
+        @app.get('/items')
+        @cached_response(self.cache, stamp=stamp)
+        @conditional_get(stamp)
+        def items():
+            return self.respond('all')
+
+        self.client = app.test_client()
+
+    def respond(self, body):
+        self.calls += 1
+        if self.partial:
+            mark_partial()
+        return jsonify({'body': body, 'call': self.calls}), self.status
+
+
+@pytest.fixture
+def view():
+    return View()
+
+
+def test_serves_repeats_from_the_cache(view):
+    first = view.client.get('/items/1')
+    second = view.client.get('/items/1')
+    assert view.calls == 1
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_query_args_are_part_of_the_key(view):
+    view.client.get('/items?page=1')
+    view.client.get('/items?page=2')
+    assert view.calls == 2
+
+
+def test_a_new_stamp_misses(view):
+    view.client.get('/items/1')
+    view.version = 2
+    response = view.client.get('/items/1')
+    assert view.calls == 2
+    assert response.json['call'] == 2
+
+
+def test_tag_invalidation_drops_a_tagged_response(view):
+    view.client.get('/items/1')
+    view.cache.invalidate_tag('1')
+    view.client.get('/items/1')
+    assert view.calls == 2
+
+
+def test_generation_bump_drops_untagged_responses(view):
+    view.client.get('/items')
+    view.client.get('/items/1')
+    view.cache.bump_generation()
+    view.client.get('/items')
+    view.client.get('/items/1')
+    # Tagged responses aren't keyed on the generation.
+    assert view.calls == 3
+
+
+def test_partial_responses_are_not_cached(view):
+    view.partial = True
+    response = view.client.get('/items')
+    view.client.get('/items')
+    assert view.calls == 2
+    assert 'no-store' in response.headers['Cache-Control']
+
+
+def test_errors_are_not_cached(view):
+    view.status = 404
+    view.client.get('/items/1')
+    view.client.get('/items/1')
+    assert view.calls == 2
+
+
+def test_matching_etag_gets_304_without_running_the_view(view):
+    etag = view.client.get('/items/1').headers['ETag']
+    view.cache.clear()
+    response = view.client.get('/items/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert view.calls == 1
+
+
+def test_cached_response_answers_304_too(view):
+    etag = view.client.get('/items/1').headers['ETag']
+    response = view.client.get('/items/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert view.calls == 1
+
+
+def test_stale_etag_gets_the_new_body(view):
+    etag = view.client.get('/items/1').headers['ETag']
+    view.version = 2
+    response = view.client.get('/items/1', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_if_modified_since(view):
+    view.client.get('/items/1')
+    response = view.client.get('/items/1', headers={'If-Modified-Since': 'Thu, 01 Jan 2026 00:00:00 GMT'})
+    assert response.status_code == 304
+
+
+def test_cached_documents_loads_only_the_missing_ids():
+    cache = LRUCache()
+    loaded = []
+
+    def load(ids):
+        loaded.append(list(ids))
+        return {id: {'_id': id} for id in ids if id != 'gone'}
+
+    assert cached_documents(['a', 'b'], ('_id',), 1, load, cache) == {'a': {'_id': 'a'}, 'b': {'_id': 'b'}}
+    assert cached_documents(['a', 'c', 'gone'], ('_id',), 1, load, cache) == {'a': {'_id': 'a'}, 'c': {'_id': 'c'}}
+    assert loaded == [['a', 'b'], ['c', 'gone']]
+
+
+def test_cached_documents_are_keyed_on_version_and_tagged_by_id():
+    cache = LRUCache()
+    loaded = []
+
+    def load(ids):
+        loaded.extend(ids)
+        return {id: {'_id': id} for id in ids}
+
+    cached_documents(['a', 'b'], ('_id',), 1, load, cache)
+    cached_documents(['a'], ('_id',), 2, load, cache)
+    cache.invalidate_tag('b')
+    cached_documents(['b'], ('_id',), 1, load, cache)
+    assert loaded == ['a', 'b', 'a', 'b']
@@ -0,0 +1,33 @@
+"""Search term and trigram extraction."""
+from src.modules.search import MAX_QUERY_TERMS, query_terms, title_key, trigrams
+
+
+def test_query_terms_are_normalized_and_deduplicated():
+    assert query_terms("Café, cafe CAFÉ! Mongo-cursor") == ['cafe', 'mongo', 'cursor']
+
+
+def test_query_terms_are_capped():
+    terms = query_terms(' '.join(f"word{index}" for index in range(MAX_QUERY_TERMS + 5)))
+    assert terms == [f"word{index}" for index in range(MAX_QUERY_TERMS)]
+
+
+def test_query_terms_of_punctuation_only():
+    assert query_terms("?! --") == []
+
+
+def test_trigrams_are_distinct_sorted_and_normalized():
+    assert trigrams("Ábab") == ['aba', 'bab']
+    assert trigrams("aaaa") == ['aaa']
+
+
+def test_trigrams_keep_spaces_between_words():
+    assert trigrams("a bc") == [' bc', 'a b']
+
+
+def test_short_text_has_no_trigrams():
+    assert trigrams("ab") == []
+    assert trigrams(None) == []
+
+
+def test_title_key_collapses_whitespace():
+    assert title_key("  Hello   Wörld ") == "hello world"
@@ -0,0 +1,49 @@
+"""Serializer: projections, conversions and documents missing fields."""
+from bson.objectid import ObjectId
+from src.modules.Serializer import Serializer
+
+ID = ObjectId()
+
+
+def test_compile_is_shared_per_attribute_set():
+    assert Serializer.compile(['_id', 'title']) is Serializer.compile(('_id', 'title'))
+    assert Serializer.compile(['_id', 'title']) is not Serializer.compile(['title', '_id'])
+
+
+def test_projection_leaves_out_id_unless_needed():
+    assert Serializer.compile(['title']).projection() == {'title': 1, '_id': 0}
+    assert Serializer.compile(['_id', 'title']).projection() == {'_id': 1, 'title': 1}
+
+
+def test_projection_is_a_copy():
+    serializer = Serializer.compile(['title'])
+    serializer.projection()['body'] = 1
+    assert serializer.projection() == {'title': 1, '_id': 0}
+
+
+def test_serialize_keeps_order_and_converts_ids():
+    document = {'title': "Title", '_id': ID, 'body': "Body"}
+    result = Serializer.compile(['_id', 'title']).serialize(document)
+    assert result == {'_id': str(ID), 'title': "Title"}
+    assert list(result) == ['_id', 'title']
+
+
+def test_single_and_empty_attribute_sets():
+    assert Serializer.compile(['title']).serialize({'title': "Title"}) == {'title': "Title"}
+    assert Serializer.compile([]).serialize({'title': "Title"}) == {}
+
+
+def test_missing_fields_are_none():
+    result = Serializer.compile(['_id', 'title', 'excerpt']).serialize({'_id': ID, 'title': "Title"})
+    assert result == {'_id': str(ID), 'title': "Title", 'excerpt': None}
+
+
+def test_none_id_is_not_converted():
+    assert Serializer.compile(['_id']).serialize({'_id': None}) == {'_id': None}
+
+
+def test_dump_does_not_mutate_documents():
+    documents = [{'_id': ID, 'title': "One"}, {'_id': ID, 'title': "Two"}]
+    dumped = Serializer.compile(['_id', 'title']).dump(iter(documents))
+    assert [document['title'] for document in dumped] == ["One", "Two"]
+    assert documents[0]['_id'] is ID
@@ -0,0 +1,53 @@
+"""Slow query log redaction and summaries."""
+import json
+from src.modules.slow_query import query_shape, redact, summarize
+
+
+def test_redact_keeps_keys_and_operators():
+    assert redact({'title': "secret", 'created_at': {'$gt': 5}}) == {'title': '?', 'created_at': {'$gt': '?'}}
+
+
+def test_redact_collapses_literal_lists():
+    assert redact({'_id': {'$in': [1, 2, 3]}}) == redact({'_id': {'$in': [4]}}) == {'_id': {'$in': ['?']}}
+
+
+def test_redact_keeps_lists_of_documents():
+    pipeline = [{'$match': {'a': 1}}, {'$limit': 10}]
+    assert redact(pipeline) == [{'$match': {'a': '?'}}, {'$limit': '?'}]
+
+
+def test_query_shape_only_keeps_shape_fields():
+    command = {'find': 'articles', 'filter': {'admin_id': "x"}, 'limit': 10, 'lsid': {'id': "session"}}
+    assert query_shape(command) == {'filter': {'admin_id': '?'}}
+
+
+def entry(duration_ms, shape=None, route='/a', plan=None, pool_wait_ms=0):
+    return json.dumps({
+        'collection': 'articles',
+        'command': 'find',
+        'shape': shape or {'filter': {'title': '?'}},
+        'duration_ms': duration_ms,
+        'pool_wait_ms': pool_wait_ms,
+        'route': route,
+        'plan': plan
+    })
+
+
+def test_summarize_groups_by_shape_slowest_total_first():
+    lines = [
+        entry(100, route='/a', plan="IXSCAN title", pool_wait_ms=1.5),
+        entry(300, route='/b', pool_wait_ms=2),
+        entry(200),
+        entry(250, shape={'filter': {'body': '?'}}),
+        "not json",
+    ]
+    first, second = summarize(lines)
+    assert (first['count'], first['total_ms'], first['p50_ms'], first['max_ms']) == (3, 600, 200, 300)
+    assert first['routes'] == ['/a', '/b']
+    assert first['plans'] == ["IXSCAN title"]
+    assert first['pool_wait_ms'] == 3.5
+    assert (second['shape'], second['count']) == ({'filter': {'body': '?'}}, 1)
+
+
+def test_summarize_empty_log():
+    assert summarize([]) == []
@@ -0,0 +1,45 @@
+"""Startup regression guard.
+
+Imports the app in a fresh interpreter under `-X importtime` and checks the
+cumulative time of `import app` against STARTUP_IMPORT_BUDGET_MS, and that
+the modules kept off the startup path stay off it. Needs no database.
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_MS = float(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 1000))
+# Imported on first use of the database, the metrics listener or the hasher pool.
+DEFERRED_MODULES = ('pymongo', 'pymongo.monitoring', 'multiprocessing', 'concurrent.futures.process')
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+@pytest.fixture(scope='module')
+def times():
+    """{module: cumulative microseconds} for `import app` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'))
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def test_import_app_within_budget(times):
+    cumulative_ms = times['app'] / 1000
+    slowest = sorted(((us, name) for name, us in times.items() if name != 'app'), reverse=True)[:10]
+    assert cumulative_ms <= BUDGET_MS, f"import app took {cumulative_ms:.0f}ms, budget is {BUDGET_MS:.0f}ms; slowest: {slowest}"
+
+
+def test_deferred_modules_stay_off_the_startup_path(times):
+    imported = [module for module in DEFERRED_MODULES if module in times]
+    assert not imported, f"imported at startup: {imported}"